@@ -0,0 +1,228 @@
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Ayrıştırılmış .c3d planlarının ikili önbelleği
+C3D_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.rv_mazaka', 'c3d_cache')
+C3D_CACHE_VERSION = 3
+
+
+C3D_DEFAULT_COLUMNS = ['id', 'northing', 'easting', 'altitude', 'ground_altitude', 'yaw', 'object_type']
+# Metin olarak kalması gereken sütunlar ("01.03" bir sayı değil, kazık numarası)
+C3D_TEXT_COLUMNS = {'id', 'object_type'}
+C3D_DEFAULT_COLOR = '#B24A3B'  # point_color'da olmayan tipler
+C3D_UNKNOWN_TYPE = 'unknown'  # object_type sütunu boş bırakılmış satırlar
+
+
+def read_c3d_header(text):
+    """
+    Splits a .c3d document into its JSON header and point table.
+
+    Args:
+        text (str): Whole file contents.
+
+    Returns:
+        tuple: (header dict, offset of the point table in text). Files
+        without a JSON header return ({}, 0).
+    """
+    start = len(text) - len(text.lstrip())
+    if not text.startswith('{', start):
+        return {}, 0
+    header, end = json.JSONDecoder().raw_decode(text, start)
+    return header, end
+
+
+def parse_c3d_file_to_dataframe(file_path):
+    """
+    Parses a .c3d stake-out plan into a DataFrame.
+
+    The column layout comes from the header's "columns" list; the point
+    table is read in one pass by pandas' C parser with explicit dtypes.
+    Rows that leave out trailing columns get NaN; a missing object_type
+    becomes C3D_UNKNOWN_TYPE. A "color" column is added from
+    point_color["object_type"] (C3D_DEFAULT_COLOR for types not listed).
+    The header itself is kept in df.attrs['c3d_header'].
+
+    Args:
+        file_path (str): Path to the .c3d file.
+
+    Returns:
+        pd.DataFrame: One row per point.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    header, offset = read_c3d_header(text)
+
+    columns = list(header.get('columns') or C3D_DEFAULT_COLUMNS)
+    dtypes = {name: (str if name in C3D_TEXT_COLUMNS else np.float64) for name in columns}
+    table = io.StringIO(text)
+    table.seek(offset)
+    df = pd.read_csv(
+        table, sep='\t', header=None, names=columns,
+        dtype=dtypes, engine='c', skip_blank_lines=True, on_bad_lines='skip'
+    )
+
+    # En azından konum sütunları okunamayan satırları at
+    required = [name for name in ('northing', 'easting') if name in columns]
+    if required and df[required].isna().any(axis=None):
+        df = df.dropna(subset=required).reset_index(drop=True)
+
+    type_colors = header.get('point_color', {}).get('object_type', {})
+    if 'object_type' in df.columns:
+        if df['object_type'].isna().any():
+            df['object_type'] = df['object_type'].fillna(C3D_UNKNOWN_TYPE)
+        df['color'] = df['object_type'].map(type_colors).fillna(C3D_DEFAULT_COLOR)
+
+    df.attrs['c3d_header'] = header
+    return df
+
+
+def _file_sha1(file_path):
+    h = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _cache_paths(file_path, cache_dir):
+    key = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+    base = os.path.join(cache_dir, key)
+    return base + '.npy', base + '.json'
+
+
+def _dataframe_to_records(df):
+    columns = []
+    for name in df.columns:
+        values = df[name].to_numpy()
+        if values.dtype == object:
+            values = values.astype(str)
+        columns.append(values)
+    return np.rec.fromarrays(columns, names=list(df.columns)).view(np.ndarray)
+
+
+def load_c3d(file_path, cache_dir=C3D_CACHE_DIR, parse=parse_c3d_file_to_dataframe):
+    """
+    Loads a .c3d plan as a DataFrame, using a binary cache when valid.
+
+    The parsed columns are stored as a structured .npy file and a .json
+    key (path, mtime, size, SHA-1) in cache_dir. When mtime and size
+    match, the .npy file is memory-mapped without reading the .c3d. When
+    only mtime changed but the content hash is the same, the cache is
+    reused and its key refreshed. Otherwise the file is parsed again.
+    If the cache cannot be written the plan is still returned and the
+    error text is left in df.attrs['c3d_cache_error'].
+
+    Args:
+        file_path (str): Path to the .c3d file.
+        cache_dir (str, optional): Cache directory; None disables caching.
+        parse (callable, optional): Parser used on a cache miss.
+
+    Returns:
+        pd.DataFrame: Parsed plan.
+    """
+    if cache_dir is None:
+        return parse(file_path)
+
+    npy_path, meta_path = _cache_paths(file_path, cache_dir)
+    st = os.stat(file_path)
+    key = {
+        'version': C3D_CACHE_VERSION,
+        'path': os.path.abspath(file_path),
+        'mtime_ns': st.st_mtime_ns,
+        'size': st.st_size,
+    }
+
+    meta = None
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    sha1 = None
+    if meta is not None and os.path.exists(npy_path) and all(meta.get(k) == v for k, v in key.items() if k != 'mtime_ns'):
+        hit = meta.get('mtime_ns') == key['mtime_ns']
+        if not hit:
+            # Dosyaya dokunulmuş ama içerik aynı olabilir
+            sha1 = _file_sha1(file_path)
+            hit = meta.get('sha1') == sha1
+        if hit:
+            try:
+                records = np.load(npy_path, mmap_mode='r')
+            except (OSError, ValueError):
+                records = None
+            if records is not None:
+                if meta.get('mtime_ns') != key['mtime_ns']:
+                    _write_meta(meta_path, dict(key, sha1=sha1, attrs=meta.get('attrs', {})))
+                df = pd.DataFrame(records)
+                df.attrs.update(meta.get('attrs', {}))
+                return df
+
+    df = parse(file_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(npy_path, _dataframe_to_records(df))
+        _write_meta(meta_path, dict(key, sha1=sha1 or _file_sha1(file_path), attrs=df.attrs))
+    except OSError as e:
+        df.attrs['c3d_cache_error'] = f"c3d önbelleği yazılamadı: {e}"
+    return df
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = meta_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def benchmark(n_points=100000, file_path='c3d_benchmark.c3d'):
+    """100k noktalı sentetik planla satır satır ayrıştırma ile vektörel okuyucuyu karşılaştır."""
+    rng = np.random.default_rng(0)
+    header = {
+        'version': 1,
+        'columns': C3D_DEFAULT_COLUMNS,
+        'point_color': {'object_type': {'HEA160-3.3': '#f5a029', 'Sigma65-3': '#84700b'}},
+        'units': {'length': 'meter', 'plane_angle': 'degree'},
+    }
+    types = np.array(['HEA160-3.3', 'Sigma65-3'])[rng.integers(0, 2, n_points)]
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(header, f, indent='\t')
+        f.write('\n')
+        for i in range(n_points):
+            f.write(f"{i // 100:03d}.{i % 100:02d}\t{38.69 + rng.random() * 0.01:.8f}\t{35.38 + rng.random() * 0.01:.8f}"
+                    f"\t1101.32\t1\t2\t{types[i]}\n")
+
+    def line_by_line(path):
+        rows = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f.readlines():
+                parts = line.split()
+                try:
+                    rows.append((parts[0], float(parts[1]), float(parts[2]), float(parts[3]),
+                                 float(parts[4]), float(parts[5]), parts[6]))
+                except (IndexError, ValueError):
+                    continue
+        return pd.DataFrame(rows, columns=C3D_DEFAULT_COLUMNS)
+
+    try:
+        for name, parse in (("satır satır", line_by_line), ("vektörel", parse_c3d_file_to_dataframe)):
+            best = float('inf')
+            for _ in range(3):
+                t0 = time.perf_counter()
+                df = parse(file_path)
+                best = min(best, time.perf_counter() - t0)
+            print(f"{name:12s}: {len(df)} nokta, {best * 1000:.1f} ms (3 denemenin en iyisi)")
+    finally:
+        os.remove(file_path)
+
+
+if __name__ == "__main__":
+    # python c3dReader.py [nokta sayısı]
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -1,6 +1,8 @@
 import serial
 import time
 
+from modbusRtu import check_crc, decode_registers, read_input_registers_request
+
 def send_command_and_read_response(ser, command, response_length=7):
     try:
         # Komutu gönder
@@ -15,11 +17,10 @@ def send_command_and_read_response(ser, command, response_length=7):
         print(f"Seri port hatası: {e}")
         return None
 
-def parse_response(response):
-    if len(response) >= 5:
-        # Dördüncü ve beşinci byte'ları al
-        value = response[3] << 8 | response[4]
-        return value
+def parse_response(response, count=1):
+    if len(response) >= 5 and check_crc(response):
+        # Tüm register'lar tek yanıtta; ilki mesafe
+        return int(decode_registers(response, count)[0])
     return None
 
 def scale_value(value, min_val, max_val, min_dist, max_dist):
@@ -34,7 +35,7 @@ def scale_value(value, min_val, max_val, min_dist, max_dist):
         return scaled_value
 
 def read_from_serial(port='COM6', baudrate=9600, timeout=1):
-    command = bytes.fromhex('01 04 00 00 00 01 31 CA')
+    command = read_input_registers_request(1, 0, 1)  # 01 04 00 00 00 01 31 CA
     min_val = 4000
     max_val = 20000
     min_dist = 297  # mm
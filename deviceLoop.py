@@ -0,0 +1,283 @@
+import asyncio
+import threading
+import time
+
+# Tüm cihaz G/Ç'si tek asyncio döngüsünde, tek iş parçacığında çalışır
+DEVICE_CONNECT_TIMEOUT = 3.0  # TCP bağlantı kurma üst sınırı (s)
+DEVICE_SHUTDOWN_TIMEOUT = 1.0  # stop() en fazla bu kadar bekler (s)
+SERIAL_POLL_INTERVAL = 0.002  # add_reader olmayan döngülerde (Windows) seri port yoklama aralığı (s)
+
+
+class DeviceLoop:
+    """
+    Cihaz G/Ç'si için ayrı iş parçacığında çalışan asyncio döngüsü.
+
+    GNSS soketi, seri port ve sonraki cihazlar bu döngüde görev olarak
+    çalışır; hiçbiri kendi iş parçacığını bloklamaz. Görevler GUI
+    iş parçacığından spawn() ile başlatılır, stop() hepsini iptal edip
+    döngüyü DEVICE_SHUTDOWN_TIMEOUT içinde kapatır. Qt'ye sonuçlar sinyal
+    ile (kuyruklu bağlantı) döner.
+    """
+
+    def __init__(self, name='devices'):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def start(self):
+        if not self._thread.is_alive():
+            self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    def spawn(self, coro):
+        """Coroutine'i döngüde görev olarak başlat (her iş parçacığından); concurrent Future döndürür."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self, timeout=DEVICE_SHUTDOWN_TIMEOUT):
+        """
+        Cancels every device task and stops the loop.
+
+        Args:
+            timeout (float, optional): Upper bound for the whole shutdown.
+
+        Returns:
+            float: Seconds the shutdown took.
+        """
+        if not self._thread.is_alive():
+            return 0.0
+        t0 = time.perf_counter()
+        future = asyncio.run_coroutine_threadsafe(self._cancel_all(timeout), self.loop)
+        try:
+            future.result(timeout)
+        except Exception:
+            pass  # Zaman aşımı: görevler yine de iptal edildi, döngüyü durdur
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(max(0.0, timeout - (time.perf_counter() - t0)))
+        return time.perf_counter() - t0
+
+    async def _cancel_all(self, timeout):
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+
+
+class _FramedProtocol(asyncio.BufferedProtocol):
+    """Soket verisini doğrudan çerçeveleyicinin tamponuna alan protokol (kopya yok)."""
+
+    def __init__(self, framer, on_sentences):
+        self.framer = framer
+        self.on_sentences = on_sentences
+        self.closed = asyncio.get_running_loop().create_future()
+        self.last_data = time.monotonic()
+
+    def get_buffer(self, sizehint):
+        return self.framer.recv_buffer()
+
+    def buffer_updated(self, nbytes):
+        t_recv = time.perf_counter()
+        self.last_data = time.monotonic()
+        sentences = self.framer.commit(nbytes)
+        if sentences:
+            self.on_sentences(sentences, t_recv, time.perf_counter())
+
+    def connection_lost(self, exc):
+        if not self.closed.done():
+            self.closed.set_result(exc)
+
+
+class TcpLink:
+    """Kopan ya da sessiz kalan bağlantıyı kendiliğinden yenileyen TCP okuyucu istatistikleri."""
+
+    def __init__(self):
+        self.n_connects = 0
+        self.n_disconnects = 0
+        self.n_timeouts = 0
+        self.connected = False
+
+
+async def tcp_stream(host, port, make_framer, on_sentences, link=None, recv_timeout=5.0, reconnect_delay=1.0,
+                     on_status=None):
+    """
+    Reads a line-framed TCP stream forever, reconnecting as needed.
+
+    Args:
+        host (str): Server address.
+        port (int): Server port.
+        make_framer (callable): Returns a fresh framer (GpchcFramer) per connection.
+        on_sentences (callable): Called in the loop thread with
+            (sentences, t_recv, t_frame) for every read that completed sentences.
+        link (TcpLink, optional): Connection counters, updated in place.
+        recv_timeout (float, optional): Silence after which the link is
+            considered dead and reopened.
+        reconnect_delay (float, optional): Wait before reconnecting.
+        on_status (callable, optional): Called in the loop thread with a
+            message when the connection is made, lost or fails.
+    """
+    loop = asyncio.get_running_loop()
+    link = link or TcpLink()
+    report = on_status or (lambda message: None)
+    while True:
+        try:
+            transport, protocol = await asyncio.wait_for(
+                loop.create_connection(lambda: _FramedProtocol(make_framer(), on_sentences), host, port),
+                DEVICE_CONNECT_TIMEOUT)
+        except (OSError, asyncio.TimeoutError) as e:
+            report(f"GNSS bağlantı hatası {host}:{port}: {e!r}")
+            await asyncio.sleep(reconnect_delay)
+            continue
+        link.n_connects += 1
+        link.connected = True
+        report(f"GNSS bağlandı {host}:{port}")
+        try:
+            while not protocol.closed.done():
+                idle = time.monotonic() - protocol.last_data
+                if idle >= recv_timeout:
+                    link.n_timeouts += 1
+                    break
+                await asyncio.wait([protocol.closed], timeout=recv_timeout - idle)
+        finally:
+            link.connected = False
+            transport.abort()
+        link.n_disconnects += 1
+        report(f"GNSS bağlantısı koptu {host}:{port}, yeniden bağlanılıyor")
+        await asyncio.sleep(reconnect_delay)
+
+
+class AsyncSerial:
+    """
+    pyserial portu için engellemeyen okuma/yazma.
+
+    Port timeout=0 ile açılır. POSIX'te okunabilirlik add_reader ile
+    bildirilir; add_reader desteklemeyen döngülerde (Windows Proactor)
+    port SERIAL_POLL_INTERVAL aralıkla yoklanır. Okuma hiçbir zaman
+    iş parçacığını bloklamaz, görev iptal edilince hemen biter. Port
+    giderse (USB çıkarıldı) bekleyen ve sonraki okumalar hatayı fırlatır.
+    """
+
+    def __init__(self, ser):
+        self.ser = ser
+        self.loop = asyncio.get_running_loop()
+        self._buf = bytearray()
+        self.last_activity = self.loop.time()  # Son bayt alındığı/gönderildiği an (döngü saati)
+        self._event = asyncio.Event()
+        self._evented = False
+        self._error = None  # add_reader geri çağrısında oluşan port hatası
+        try:
+            self._fd = ser.fileno()
+            self.loop.add_reader(self._fd, self._on_readable)
+            self._evented = True
+        except (AttributeError, NotImplementedError, OSError, ValueError):
+            pass
+
+    def _pull(self):
+        waiting = self.ser.in_waiting
+        if waiting:
+            self._buf += self.ser.read(waiting)
+            self.last_activity = self.loop.time()
+
+    def _on_readable(self):
+        try:
+            self._pull()
+        except OSError as e:
+            # Port gitti; fd hep okunabilir kalır, dinlemeyi bırak ve hatayı okuyana ilet
+            self.loop.remove_reader(self._fd)
+            self._evented = False
+            self._error = e
+        self._event.set()
+
+    def _check(self):
+        if self._error is not None:
+            raise self._error
+
+    def write(self, data):
+        self.ser.write(data)
+        self.last_activity = self.loop.time()
+
+    def reset_input(self):
+        """Önceki işlemden kalan baytları at."""
+        if not self._evented:
+            self._pull()
+        self._buf.clear()
+
+    async def read(self, n, timeout):
+        """En fazla n bayt oku; timeout dolarsa gelenleri (belki eksik) döndür."""
+        self._check()
+        deadline = self.loop.time() + timeout
+        while len(self._buf) < n:
+            remaining = deadline - self.loop.time()
+            if remaining <= 0:
+                break
+            self._event.clear()
+            wait = remaining if self._evented else min(remaining, SERIAL_POLL_INTERVAL)
+            try:
+                await asyncio.wait_for(self._event.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+            self._check()
+            if not self._evented:
+                self._pull()
+        data = bytes(self._buf[:n])
+        del self._buf[:n]
+        return data
+
+    async def read_frame(self, n, timeout, gap):
+        """
+        Reads one frame that ends after n bytes or after a silent gap.
+
+        Args:
+            n (int): Longest expected frame.
+            timeout (float): Wait for the first byte and the whole frame.
+            gap (float): Silence after a received byte that ends the frame
+                (Modbus RTU: 3.5 character times).
+
+        Returns:
+            bytes: The frame, possibly empty or short on timeout.
+
+        Raises:
+            OSError: If the port failed (serial.SerialException included).
+        """
+        self._check()
+        deadline = self.loop.time() + timeout
+        seen = len(self._buf)
+        last_byte = self.loop.time() if seen else None
+        while len(self._buf) < n:
+            now = self.loop.time()
+            limit = deadline - now
+            if last_byte is not None:
+                limit = min(limit, last_byte + gap - now)
+            if limit <= 0:
+                break
+            self._event.clear()
+            wait = limit if self._evented else min(limit, SERIAL_POLL_INTERVAL)
+            try:
+                await asyncio.wait_for(self._event.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+            self._check()
+            if not self._evented:
+                self._pull()
+            if len(self._buf) != seen:
+                seen = len(self._buf)
+                last_byte = self.last_activity
+        data = bytes(self._buf[:n])
+        del self._buf[:n]
+        return data
+
+    def close(self):
+        if self._evented:
+            self.loop.remove_reader(self._fd)
+            self._evented = False
+        self.ser.close()
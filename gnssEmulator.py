@@ -0,0 +1,236 @@
+import math
+import random
+import socket
+import sys
+import threading
+import time
+
+from gnssLog import load_replay
+from gnssStream import nmea_checksum
+
+# Alıcının varsayılan adresi yerine yerel test sunucusu
+EMULATOR_HOST = '127.0.0.1'
+EMULATOR_PORT = 9904
+METERS_PER_DEGREE = 111320.0
+
+
+def gpchc_sentence(gps_week, gps_time, heading, latitude, longitude, altitude, ve, vn, vu=0.0,
+                   gyro_z=0.0, pitch=0.0, roll=0.0, nsv=15, status=0x61, warning=0x0002):
+    """
+    Builds a checksummed $GPCHC sentence in the receiver's field format.
+
+    Args:
+        gps_week (int): GPS week.
+        gps_time (float): Seconds into the GPS week.
+        heading (float): Degrees, clockwise from north.
+        latitude, longitude (float): Degrees.
+        altitude (float): Meters.
+        ve, vn, vu (float): East, north and up velocity (m/s).
+        gyro_z (float, optional): Yaw rate (deg/s).
+
+    Returns:
+        bytes: Sentence without line ending.
+    """
+    body = (f"GPCHC,{gps_week},{gps_time:.2f},{heading:.2f},{pitch:.2f},{roll:.2f},0.00,0.00,{gyro_z:.2f},"
+            f"0.0000,0.0000,1.0000,{latitude:.8f},{longitude:.8f},{altitude:.2f},"
+            f"{ve:.3f},{vn:.3f},{vu:.3f},{math.hypot(ve, vn):.3f},{nsv},0,{status:02X},0,{warning:04X}").encode()
+    return b'$%s*%02X' % (body, nmea_checksum(body))
+
+
+def corrupt_checksum(sentence):
+    """Cümlenin *XX checksum'ını boz (çerçeveleyici atmalı)."""
+    return sentence[:-2] + b'%02X' % (int(sentence[-2:], 16) ^ 0xFF)
+
+
+def circle_source(rate, longitude=35.38464100, latitude=38.69935827, radius=20.0, speed=1.0,
+                  gps_week=2351, gps_time=297135.0):
+    """
+    Sentez yörünge: merkez etrafında sabit hızla çember.
+
+    Heading, Ve/Vn ve gyro z birbiriyle tutarlıdır; ölü hesap ve gecikme
+    ölçümleri için gerçek sürüşün yerine kullanılabilir.
+    """
+    omega = speed / radius  # rad/s, saat yönü tersine
+    dt = 1.0 / rate
+    m_per_lon = METERS_PER_DEGREE * math.cos(math.radians(latitude))
+    k = 0
+    while True:
+        t = k * dt
+        a = omega * t
+        x, y = radius * math.cos(a), radius * math.sin(a)
+        ve, vn = -speed * math.sin(a), speed * math.cos(a)
+        heading = math.degrees(math.atan2(ve, vn)) % 360.0
+        yield gpchc_sentence(gps_week, (gps_time + t) % 604800, heading, latitude + y / METERS_PER_DEGREE,
+                             longitude + x / m_per_lon, 1000.0, ve, vn, gyro_z=-math.degrees(omega))
+        k += 1
+
+
+def log_source(rate, source='.'):
+    """Log cümlelerini sırayla ve sonsuz döngüde ver (zamanlama emülatörde)."""
+    sentences, _ = load_replay(source)
+    if not sentences:
+        raise ValueError(f"{source!r} içinde $GPCHC cümlesi yok")
+    while True:
+        yield from sentences
+
+
+class GnssEmulator:
+    """
+    Alıcının GPCHC TCP akışını taklit eden yerel sunucu.
+
+    Her istemciye kendi iş parçacığında, kaynaktan gelen cümleler verilen
+    hızda (1-200 Hz) gönderilir. Test için:
+      chunk: (en az, en çok) bayt; akış rastgele parçalara bölünür,
+             cümleler parça sınırlarında yarılır
+      jitter: her gönderim zamanına eklenen ±saniye
+      corrupt: bir cümlenin checksum'ının bozulma olasılığı
+      disconnect_every: bu kadar saniyede bir bağlantıyı (bir cümleyi yarım
+             bırakarak) kopar; down_time boyunca yeni bağlantılar reddedilir
+    """
+
+    def __init__(self, host=EMULATOR_HOST, port=EMULATOR_PORT, source=circle_source, rate=20.0, chunk=None,
+                 jitter=0.0, corrupt=0.0, disconnect_every=0.0, down_time=0.0, seed=None):
+        """
+        :param source: rate alıp bayt cümle üreteci döndüren fonksiyon
+        """
+        self.host = host
+        self.port = port
+        self.source = source
+        self.rate = rate
+        self.chunk = chunk
+        self.jitter = jitter
+        self.corrupt = corrupt
+        self.disconnect_every = disconnect_every
+        self.down_time = down_time
+        self.rng = random.Random(seed)
+        self.n_clients = 0
+        self.n_refused = 0
+        self.n_sentences = 0
+        self.n_corrupted = 0
+        self.n_disconnects = 0
+        self.n_bytes = 0
+        self.running = False
+        self._down_until = 0.0
+        self._server = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Sunucuyu arka planda başlat; gerçek portu döndür (port=0 ise rastgele)."""
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((self.host, self.port))
+        self._server.listen()
+        self.port = self._server.getsockname()[1]
+        self.running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self.port
+
+    def stop(self):
+        self.running = False
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                break  # stop() soketi kapattı
+            if time.monotonic() < self._down_until:
+                self.n_refused += 1
+                client.close()
+                continue
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Parçalar ayrı segment gitsin
+            self.n_clients += 1
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+
+    def _serve(self, client):
+        sentences = self.source(self.rate)
+        period = 1.0 / self.rate
+        start = time.perf_counter()
+        k = 0
+        try:
+            while self.running:
+                due = start + k * period
+                if self.jitter:
+                    due += self.rng.uniform(-self.jitter, self.jitter)
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                k += 1
+
+                sentence = next(sentences)
+                if self.corrupt and self.rng.random() < self.corrupt:
+                    sentence = corrupt_checksum(sentence)
+                    self.n_corrupted += 1
+                data = sentence + b'\r\n'
+
+                if self.disconnect_every and time.perf_counter() - start >= self.disconnect_every:
+                    client.sendall(data[:len(data) // 2])  # Yarım cümle ve kopma
+                    with self._lock:
+                        self.n_disconnects += 1
+                        self._down_until = time.monotonic() + self.down_time
+                    break
+
+                self._send(client, data)
+                with self._lock:
+                    self.n_sentences += 1
+                    self.n_bytes += len(data)
+        except OSError:
+            pass  # İstemci bağlantıyı kapattı
+        finally:
+            client.close()
+
+    def _send(self, client, data):
+        if not self.chunk:
+            client.sendall(data)
+            return
+        low, high = self.chunk
+        pos = 0
+        while pos < len(data):
+            n = self.rng.randint(low, high)
+            client.sendall(data[pos:pos + n])
+            pos += n
+
+    def stats(self):
+        return (f"istemci {self.n_clients} (reddedilen {self.n_refused}), cümle {self.n_sentences}, "
+                f"bozuk {self.n_corrupted}, kopma {self.n_disconnects}, {self.n_bytes / 1024:.0f} kB")
+
+
+if __name__ == "__main__":
+    # python gnssEmulator.py --rate 50 --chunk 1 64 --corrupt 0.01 --disconnect-every 30
+    # Uygulama: python main.py --gnss 127.0.0.1:9904
+    import argparse
+    parser = argparse.ArgumentParser(description="Yerel GPCHC alıcı emülatörü")
+    parser.add_argument('--host', default=EMULATOR_HOST)
+    parser.add_argument('--port', type=int, default=EMULATOR_PORT)
+    parser.add_argument('--rate', type=float, default=20.0, help="Cümle/sn (1-200)")
+    parser.add_argument('--replay', metavar='LOG', help="Sentez çember yerine log dosyası veya klasörü")
+    parser.add_argument('--radius', type=float, default=20.0, help="Sentez çember yarıçapı (m)")
+    parser.add_argument('--speed', type=float, default=1.0, help="Sentez sürüş hızı (m/s)")
+    parser.add_argument('--chunk', type=int, nargs=2, metavar=('MIN', 'MAX'), help="Rastgele parça boyu (bayt)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Gönderim zamanı sapması (±s)")
+    parser.add_argument('--corrupt', type=float, default=0.0, help="Checksum bozma olasılığı")
+    parser.add_argument('--disconnect-every', type=float, default=0.0, help="Bağlantıyı koparma aralığı (s)")
+    parser.add_argument('--down-time', type=float, default=0.0, help="Koptuktan sonra bağlantı reddetme süresi (s)")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+    if not 1 <= args.rate <= 200:
+        parser.error("--rate 1 ile 200 arasında olmalı")
+
+    if args.replay:
+        source = lambda rate: log_source(rate, args.replay)
+    else:
+        source = lambda rate: circle_source(rate, radius=args.radius, speed=args.speed)
+    emulator = GnssEmulator(args.host, args.port, source, args.rate, args.chunk, args.jitter,
+                            args.corrupt, args.disconnect_every, args.down_time, args.seed)
+    port = emulator.start()
+    print(f"GPCHC emülatörü {args.host}:{port}, {args.rate:g} Hz")
+    try:
+        while True:
+            time.sleep(5)
+            print(emulator.stats())
+    except KeyboardInterrupt:
+        emulator.stop()
+        sys.exit(0)
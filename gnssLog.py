@@ -0,0 +1,245 @@
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# 'YYYY-MM-DD HH:MM:SS - $GPCHC,<23 alan>*XX'
+_LOG_LINE = re.compile(rb'(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) - \$(GPCHC,[^*\r\n]*)\*([0-9A-Fa-f]{2})')
+# Oynatma için cümlenin tamamı (checksum'ı bozuk olanlar dahil, alıcıdan geldiği gibi)
+_LOG_SENTENCE = re.compile(rb'(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) - (\$GPCHC,[^\r\n]*)')
+GPS_WEEK_SECONDS = 604800
+REPLAY_MAX_GAP = 1.0  # Oynatmada bundan uzun (veya geriye giden) aralıklar kısaltılır (s)
+
+GPCHC_DTYPE = np.dtype([
+    ('log_time', 'datetime64[s]'),
+    ('gps_week', 'i4'), ('gps_time', 'f8'),
+    ('heading', 'f4'), ('pitch', 'f4'), ('roll', 'f4'),
+    ('gyro_x', 'f4'), ('gyro_y', 'f4'), ('gyro_z', 'f4'),
+    ('acc_x', 'f4'), ('acc_y', 'f4'), ('acc_z', 'f4'),
+    ('latitude', 'f8'), ('longitude', 'f8'), ('altitude', 'f8'),
+    ('ve', 'f4'), ('vn', 'f4'), ('vu', 'f4'), ('v', 'f4'),
+    ('nsv1', 'u1'), ('nsv2', 'u1'), ('status', 'u1'), ('age', 'u2'), ('warning', 'u2'),
+    ('system_state', 'u1'), ('satellite_state', 'u1'),
+])
+
+# Cümledeki 23 veri alanının sırası (Status ve Warning onaltılık)
+_NUMERIC_FIELDS = GPCHC_DTYPE.names[1:21]
+_HEX_FIELDS = {'status': 20, 'warning': 22}
+_INT_FIELDS = {'age': 21}
+
+
+def _float_column(col):
+    """Metin sütununu float'a çevir; (değerler, geçerli mi). Boş/sayı olmayan hücreler NaN."""
+    try:
+        values = col.astype(np.float64)
+    except ValueError:
+        # Yavaş yol sadece bozuk hücre varsa (ör. alıcı açılırken boş Age)
+        values = pd.to_numeric(pd.Series(col.astype('U')), errors='coerce').to_numpy(dtype=np.float64)
+    return values, ~np.isnan(values)
+
+
+def _hex_column(col):
+    """Az sayıda farklı değer içeren onaltılık metin sütununu tam sayıya çevir; (değerler, geçerli mi)."""
+    values, inverse = np.unique(col, return_inverse=True)
+    parsed = []
+    for v in values:
+        try:
+            parsed.append(int(v, 16))
+        except ValueError:
+            parsed.append(-1)
+    codes = np.array(parsed, dtype=np.int64)[inverse]
+    return codes, codes >= 0
+
+
+def parse_log_bytes(data):
+    """
+    Parses the raw bytes of a GPCHC capture into a structured array.
+
+    Checksums are verified for all sentences at once with
+    np.bitwise_xor.reduceat and the numeric fields are converted column
+    by column by NumPy, not per line. Rows with an invalid checksum, a
+    wrong field count, an empty or non-numeric field or a zero position
+    are dropped.
+
+    Args:
+        data (bytes): Contents of a 'timestamp - $GPCHC,...' log file.
+
+    Returns:
+        np.ndarray: Array with dtype GPCHC_DTYPE.
+    """
+    matches = _LOG_LINE.findall(data)
+    if not matches:
+        return np.empty(0, dtype=GPCHC_DTYPE)
+    stamps, bodies, checksums = zip(*matches)
+
+    # Checksum: tüm gövdeler tek tamponda, her cümlenin XOR'u tek çağrıda
+    lengths = np.fromiter(map(len, bodies), dtype=np.int64, count=len(bodies))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    joined = np.frombuffer(b''.join(bodies), dtype=np.uint8)
+    xor = np.bitwise_xor.reduceat(joined, starts)
+    expected = np.array([int(c, 16) for c in checksums], dtype=np.uint8)
+    n_fields = np.fromiter((b.count(b',') for b in bodies), dtype=np.int64, count=len(bodies))
+    valid = (xor == expected) & (n_fields == 23)
+
+    keep = np.flatnonzero(valid)
+    if not len(keep):
+        return np.empty(0, dtype=GPCHC_DTYPE)
+    fields = np.array(b','.join([bodies[i] for i in keep]).split(b',')).reshape(len(keep), 24)[:, 1:]
+
+    columns = {}
+    ok = np.ones(len(keep), dtype=bool)
+    for i, name in enumerate(_NUMERIC_FIELDS):
+        columns[name], valid = _float_column(fields[:, i])
+        ok &= valid
+    for name, i in _INT_FIELDS.items():
+        columns[name], valid = _float_column(fields[:, i])
+        ok &= valid
+    for name, i in _HEX_FIELDS.items():
+        columns[name], valid = _hex_column(fields[:, i])
+        ok &= valid
+
+    out = np.empty(np.count_nonzero(ok), dtype=GPCHC_DTYPE)
+    out['log_time'] = np.array([stamps[i].decode() for i in keep[ok]], dtype='datetime64[s]')
+    for name, values in columns.items():
+        out[name] = values[ok]
+    out['system_state'] = out['status'] & 0xF
+    out['satellite_state'] = out['status'] >> 4
+
+    return out[(out['latitude'] != 0) | (out['longitude'] != 0)]
+
+
+def _log_paths(source):
+    if isinstance(source, (str, os.PathLike)):
+        source = os.fspath(source)
+        if os.path.isdir(source):
+            return sorted(glob.glob(os.path.join(source, 'log*.txt')))
+        return [source]
+    return [os.fspath(p) for p in source]
+
+
+def _cache_key(paths):
+    """Önbellek anahtarı: kaynak dosyaların tam yolu, boyutu ve mtime'ı (sırasıyla)."""
+    key = []
+    for path in paths:
+        st = os.stat(path)
+        key.append([os.path.abspath(path), st.st_size, st.st_mtime_ns])
+    return key
+
+
+def load_gpchc_logs(source, cache_path=None):
+    """
+    Loads one log, a list of logs or a directory of log*.txt into one array.
+
+    Args:
+        source (str | list[str]): Log file, list of log files or directory.
+        cache_path (str, optional): .npy file to store the result in. A
+            .json key next to it records the source files with their size
+            and mtime; while the key matches, the .npy file is
+            memory-mapped instead of parsing the logs again. Adding,
+            removing or changing a log invalidates it.
+
+    Returns:
+        np.ndarray: Rows of all logs in order, dtype GPCHC_DTYPE.
+    """
+    paths = _log_paths(source)
+    key = _cache_key(paths) if cache_path else None
+    meta_path = cache_path + '.json' if cache_path else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                cached_key = json.load(f)
+        except (OSError, ValueError):
+            cached_key = None
+        if cached_key == key:
+            cached = np.load(cache_path, mmap_mode='r')
+            if cached.dtype == GPCHC_DTYPE:
+                return cached
+
+    parts = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            parts.append(parse_log_bytes(f.read()))
+    result = np.concatenate(parts) if parts else np.empty(0, dtype=GPCHC_DTYPE)
+
+    if cache_path:
+        np.save(cache_path, result)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(key, f)
+        result = np.load(cache_path, mmap_mode='r')
+    return result
+
+
+def _spread_within_second(stamps):
+    """Aynı saniyeye düşen ardışık cümleleri o saniyeye eşit aralıkla yay."""
+    n = len(stamps)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(stamps) != 0) + 1))
+    lengths = np.diff(np.append(starts, n))
+    k = np.arange(n) - np.repeat(starts, lengths)
+    return stamps + k / np.repeat(lengths, lengths)
+
+
+def load_replay(source, time_base='gps', max_gap=REPLAY_MAX_GAP):
+    """
+    Loads raw sentences and a playback schedule from GPCHC captures.
+
+    Args:
+        source (str | list[str]): Log file, list of log files or directory.
+        time_base (str, optional): 'gps' uses GPSWeek/GPSTime of each
+            sentence, 'log' the capture timestamp (1 s resolution; sentences
+            within the same second are spread evenly).
+        max_gap (float, optional): Gaps longer than this, backwards jumps
+            and unreadable times (e.g. between two captures) are replaced
+            with the typical sentence interval.
+
+    Returns:
+        tuple: (list of sentences as bytes without line ending,
+        np.ndarray of offsets in seconds from the first sentence).
+    """
+    stamps, sentences = [], []
+    for path in _log_paths(source):
+        with open(path, 'rb') as f:
+            for stamp, sentence in _LOG_SENTENCE.findall(f.read()):
+                stamps.append(stamp)
+                sentences.append(sentence)
+    if not sentences:
+        return [], np.empty(0)
+
+    if time_base == 'gps':
+        times = np.full(len(sentences), np.nan)
+        for i, sentence in enumerate(sentences):
+            fields = sentence.split(b',', 3)
+            try:
+                times[i] = int(fields[1]) * GPS_WEEK_SECONDS + float(fields[2])
+            except (IndexError, ValueError):
+                pass
+    elif time_base == 'log':
+        times = _spread_within_second(
+            np.array([s.decode() for s in stamps], dtype='datetime64[s]').astype(np.int64).astype(np.float64))
+    else:
+        raise ValueError(f"time_base 'gps' veya 'log' olmalı: {time_base!r}")
+
+    steps = np.diff(times)
+    good = (steps > 0) & (steps <= max_gap)
+    nominal = float(np.median(steps[good])) if good.any() else 0.0
+    steps[~good] = nominal
+    return sentences, np.concatenate(([0.0], np.cumsum(steps)))
+
+
+def to_dataframe(records):
+    """Yapılandırılmış diziyi pandas DataFrame'e çevir."""
+    return pd.DataFrame(np.asarray(records))
+
+
+if __name__ == "__main__":
+    # python gnssLog.py [log dosyaları veya klasör]
+    source = sys.argv[1] if len(sys.argv) == 2 else (sys.argv[1:] or '.')  # Tek argüman klasör olabilir
+    t0 = time.perf_counter()
+    records = load_gpchc_logs(source)
+    elapsed = time.perf_counter() - t0
+    print(f"{len(records)} kayıt, {elapsed * 1000:.1f} ms ({elapsed / max(len(records), 1) * 1e6:.2f} µs/kayıt)")
+    print(to_dataframe(records).describe())
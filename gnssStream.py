@@ -0,0 +1,337 @@
+import random
+import re
+import sys
+import threading
+import time
+from collections import namedtuple
+
+
+def nmea_checksum(body):
+    """
+    Computes the NMEA XOR checksum of a sentence body.
+
+    Args:
+        body (bytes | memoryview): Bytes between '$' and '*' (exclusive).
+
+    Returns:
+        int: XOR of all bytes (0..255).
+    """
+    cs = 0
+    for b in body:
+        cs ^= b
+    return cs
+
+
+class GpchcFramer:
+    """
+    Soket akışını '\\r\\n' ile biten $GPCHC cümlelerine ayıran çerçeveleyici.
+
+    Gelen veri tek bir yeniden kullanılan bytearray'e yazılır (recv_into ile
+    doğrudan), yarım kalan cümle bir sonraki okumaya taşınır, *XX checksum'ı
+    tutmayan cümleler atılır.
+    """
+
+    def __init__(self, buffer_size=4096, max_sentence=512):
+        self._buf = bytearray(buffer_size)
+        self._view = memoryview(self._buf)
+        self._len = 0  # Tamponda bekleyen (henüz çerçevelenmemiş) bayt sayısı
+        self.max_sentence = max_sentence
+        self.n_frames = 0
+        self.n_bad_checksum = 0
+        self.n_dropped_bytes = 0
+
+    def recv_buffer(self):
+        """sock.recv_into için tamponun boş kısmını döndür."""
+        if self._len == len(self._buf):
+            # Satır sonu gelmeden tampon doldu: çöpü at, yeniden senkronize ol
+            self.n_dropped_bytes += self._len
+            self._len = 0
+        return self._view[self._len:]
+
+    def feed(self, data):
+        """Harici bir bayt dizisini tampona kopyala ve çıkan cümleleri döndür."""
+        sentences = []
+        data = memoryview(data)
+        while len(data):
+            target = self.recv_buffer()
+            n = min(len(target), len(data))
+            target[:n] = data[:n]
+            data = data[n:]
+            sentences.extend(self.commit(n))
+        return sentences
+
+    def commit(self, nbytes):
+        """
+        Marks nbytes written into recv_buffer() as received and frames them.
+
+        Args:
+            nbytes (int): Number of bytes written by recv_into.
+
+        Returns:
+            list[bytes]: Complete, checksum-valid sentences without CR/LF.
+        """
+        buf = self._buf
+        view = self._view
+        end = self._len + nbytes
+        # Sadece yeni gelen baytlarda satır sonu ara
+        search = max(self._len - 1, 0)
+        start = 0
+        sentences = []
+        while True:
+            nl = buf.find(b'\n', search, end)
+            if nl < 0:
+                break
+            line_end = nl
+            while line_end > start and buf[line_end - 1] == 0x0D:
+                line_end -= 1
+            sentence = self._check(view, buf.find(b'$', start, line_end), line_end)
+            if sentence is not None:
+                sentences.append(sentence)
+            start = search = nl + 1
+
+        remaining = end - start
+        if remaining > self.max_sentence:
+            self.n_dropped_bytes += remaining
+            remaining = 0
+        elif start and remaining:
+            buf[:remaining] = view[start:end]  # Yarım cümleyi başa taşı
+        self._len = remaining
+        return sentences
+
+    def _check(self, view, dollar, line_end):
+        if dollar < 0:
+            return None
+        star = line_end - 3
+        if star <= dollar or view[star] != 0x2A:  # '*'
+            self.n_bad_checksum += 1
+            return None
+        try:
+            expected = int(bytes(view[star + 1:line_end]), 16)
+        except ValueError:
+            self.n_bad_checksum += 1
+            return None
+        if nmea_checksum(view[dollar + 1:star]) != expected:
+            self.n_bad_checksum += 1
+            return None
+        self.n_frames += 1
+        return bytes(view[dollar:line_end])
+
+
+_GPCHC_FIELDS = (
+    'gps_week', 'gps_time', 'heading', 'pitch', 'roll', 'gyro_x', 'gyro_y', 'gyro_z',
+    'acc_x', 'acc_y', 'acc_z', 'latitude', 'longitude', 'altitude', 've', 'vn', 'vu', 'v',
+    'nsv1', 'nsv2', 'status', 'age', 'warning', 'system_state', 'satellite_state'
+)
+
+
+class GpchcFix(namedtuple('GpchcFix', _GPCHC_FIELDS)):
+    """
+    Tek bir $GPCHC cümlesinin sayıya çevrilmiş hali.
+
+    Status alt/üst yarım baytları (system_state, satellite_state) ayrıştırma
+    sırasında hesaplanır; Warning bitleri özellik olarak okunur.
+    """
+    __slots__ = ()
+
+    @property
+    def no_gps_message(self):
+        return (self.warning & 0b0001) != 0
+
+    @property
+    def no_velocity_message(self):
+        return (self.warning & 0b0010) != 0
+
+    @property
+    def gyro_wrong(self):
+        return (self.warning & 0b0100) != 0
+
+    @property
+    def acc_wrong(self):
+        return (self.warning & 0b1000) != 0
+
+    def status_dict(self):
+        """externalFunctions.interpret_status ile uyumlu Status sözlüğü."""
+        return {"System State": self.system_state, "Satellite State": self.satellite_state}
+
+
+_new_fix = tuple.__new__
+
+
+def parse_gpchc_fix(sentence):
+    """
+    Parses a $GPCHC sentence into a GpchcFix without decoding to str.
+
+    Status and Warning are hexadecimal fields in the receiver output
+    ("61" = satellite state 6, system state 1).
+
+    Args:
+        sentence (bytes): The sentence, with or without trailing CR/LF.
+
+    Returns:
+        GpchcFix: Parsed fix with floats/ints already converted.
+
+    Raises:
+        ValueError: If the sentence does not have 23 data fields.
+    """
+    star = sentence.rfind(b'*')
+    f = sentence[sentence.index(b',') + 1:star if star >= 0 else None].split(b',')
+    if len(f) != 23:
+        raise ValueError(f"GPCHC: 23 alan bekleniyordu, {len(f)} geldi")
+    status = int(f[20], 16)
+    return _new_fix(GpchcFix, (
+        int(f[0]), float(f[1]), float(f[2]), float(f[3]), float(f[4]),
+        float(f[5]), float(f[6]), float(f[7]), float(f[8]), float(f[9]), float(f[10]),
+        float(f[11]), float(f[12]), float(f[13]),
+        float(f[14]), float(f[15]), float(f[16]), float(f[17]),
+        int(f[18]), int(f[19]), status, int(f[21]), int(f[22], 16),
+        status & 0xF, (status >> 4) & 0xF
+    ))
+
+
+class LatestMailbox:
+    """
+    Tek gözlü, iş parçacığı güvenli posta kutusu.
+
+    Üretici put() ile her zaman en yeni değeri bırakır; okunmamış eski değer
+    atılır ve n_dropped sayılır. Böylece tüketici yavaş kalsa bile kuyruk
+    büyümez, sadece en güncel değeri alır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = None
+        self._full = False
+        self.n_put = 0
+        self.n_taken = 0
+        self.n_dropped = 0
+
+    def put(self, value):
+        """
+        Stores value, replacing any unread one.
+
+        Returns:
+            bool: True if the box was empty, i.e. the consumer needs a
+            notification; False if a notification is already pending.
+        """
+        with self._lock:
+            was_full = self._full
+            if was_full:
+                self.n_dropped += 1
+            self._value = value
+            self._full = True
+            self.n_put += 1
+        return not was_full
+
+    def take(self):
+        """En yeni değeri al ve kutuyu boşalt; boşsa None döndür."""
+        with self._lock:
+            if not self._full:
+                return None
+            value = self._value
+            self._value = None
+            self._full = False
+            self.n_taken += 1
+        return value
+
+
+def read_log_sentences(path):
+    """'timestamp - $GPCHC,...' biçimindeki log dosyasından ham cümleleri oku."""
+    with open(path, 'rb') as f:
+        return re.findall(rb'\$GPCHC,[^\r\n]*', f.read())
+
+
+def read_logs(paths):
+    sentences = []
+    for path in paths:
+        sentences.extend(read_log_sentences(path))
+    return sentences
+
+
+def benchmark_framer(paths, chunk_max=256, seed=0):
+    """Log kayıtlarını rastgele parçalara bölüp çerçeveleyiciden geçir."""
+    rng = random.Random(seed)
+    sentences = read_logs(paths)
+    stream = b'\r\n'.join(sentences) + b'\r\n'
+
+    chunks = []
+    pos = 0
+    while pos < len(stream):
+        n = rng.randint(1, chunk_max)
+        chunks.append(stream[pos:pos + n])
+        pos += n
+
+    framer = GpchcFramer()
+    t0 = time.perf_counter()
+    framed = []
+    for chunk in chunks:
+        framed.extend(framer.feed(chunk))
+    elapsed = time.perf_counter() - t0
+
+    print(f"{len(sentences)} cümle, {len(chunks)} parça, {len(stream)} bayt")
+    print(f"çerçevelenen: {framer.n_frames}, hatalı checksum: {framer.n_bad_checksum}, atılan bayt: {framer.n_dropped_bytes}")
+    print(f"süre: {elapsed * 1000:.2f} ms ({elapsed / max(len(framed), 1) * 1e6:.2f} µs/cümle)")
+    return framed
+
+
+_BASELINE_FIELDS = [
+    "Header", "GPSWeek", "GPSTime", "Heading", "Pitch", "Roll", "gyro x", "gyro y", "gyro z",
+    "acc x", "acc y", "acc z", "Latitude", "Longitude", "Altitude", "Ve", "Vn", "Vu", "V",
+    "NSV1", "NSV2", "Status", "Age", "Warning", "Cs"
+]
+
+
+def _baseline_parse_gpchc_message(message):
+    """Eski sözlük ayrıştırıcısı; sadece benchmark_parser karşılaştırması için (uygulamada kullanılmaz)."""
+    message_cleaned = message.strip().decode('utf-8').replace('$', '').split('*')
+    data = message_cleaned[0].split(',') + [message_cleaned[1]]
+
+    parsed_data = {}
+    status_dict = {}
+    warning_dict = {}
+
+    for i, field in enumerate(_BASELINE_FIELDS):
+        if field == "Status":
+            status_value = int(data[i])
+            status_dict["System State"] = status_value & 0xF
+            status_dict["Satellite State"] = (status_value >> 4) & 0xF
+            parsed_data[field] = status_dict
+        elif field == "Warning":
+            warning_value = int(data[i])
+            warning_dict["No GPS message"] = (warning_value & 0b0001) != 0
+            warning_dict["No velocity message"] = (warning_value & 0b0010) != 0
+            warning_dict["gyro wrong"] = (warning_value & 0b0100) != 0
+            warning_dict["acc wrong"] = (warning_value & 0b1000) != 0
+            parsed_data[field] = warning_dict
+        else:
+            parsed_data[field] = data[i]
+
+    return parsed_data
+
+
+def benchmark_parser(paths, repeat=20):
+    """
+    Eski sözlük ayrıştırıcısı ile parse_gpchc_fix'i aynı cümlelerde karşılaştır.
+
+    Eski ayrıştırıcı alanları metin olarak bırakır; parse_gpchc_fix 23
+    alanın hepsini sayıya çevirir. Süreler yakındır: kazanç hızda değil,
+    çevirinin ayrıştırmaya dahil olmasında ve Status/Warning'in doğru
+    (onaltılık) çözülmesindedir.
+    """
+    sentences = read_logs(paths)
+
+    for name, parse in (("parse_gpchc_message", _baseline_parse_gpchc_message), ("parse_gpchc_fix", parse_gpchc_fix)):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for sentence in sentences:
+                parse(sentence)
+        per_call = (time.perf_counter() - t0) / (repeat * len(sentences))
+        print(f"{name:20s}: {per_call * 1e6:6.2f} µs/cümle ({1 / per_call:,.0f} Hz)")
+
+
+BENCHMARKS = {'frame': benchmark_framer, 'parse': benchmark_parser}
+
+if __name__ == "__main__":
+    # python gnssStream.py [frame|parse] log.txt log_2.txt ...
+    args = sys.argv[1:]
+    name = args.pop(0) if args and args[0] in BENCHMARKS else 'frame'
+    BENCHMARKS[name](args or ['log.txt', 'log_2.txt', 'log_3.txt', 'log_4.txt'])
@@ -0,0 +1,132 @@
+import numpy as np
+
+# İş durumu kodları (eski completedJobs listesiyle aynı)
+JOB_PENDING = 0
+JOB_DONE = 1
+JOB_SKIPPED = -1
+
+# Çizim için renk kodları: diğer (bekleyen / atlanan), tamamlanan, mevcut hedef
+COLOR_OTHER = 0
+COLOR_DONE = 1
+COLOR_CURRENT = 2
+
+
+class JobState:
+    """
+    Kazık işlerinin durumu.
+
+    Durumlar int8 bir dizide tutulur. Mevcut hedefin indeksi (cursor; ilk
+    bekleyen iş ya da select() ile seçilen) ve durum başına sayaçlar her
+    değişiklikte güncellenir; böylece mevcut hedef ve "hepsi bitti mi"
+    sorusu O(1) cevaplanır. Her değişiklik bir
+    günlüğe yazılır; çiziciler changes_since() ile sadece değişen k kazığı
+    yeniden boyar.
+    """
+
+    def __init__(self, n):
+        self.status = np.zeros(n, dtype=np.int8)
+        self.counts = {JOB_PENDING: n, JOB_DONE: 0, JOB_SKIPPED: 0}
+        self.cursor = 0  # Mevcut hedef (varsayılan ilk bekleyen iş); hepsi bittiyse len(self)
+        self._log = []  # Değişen indeksler, sırayla
+
+    def __len__(self):
+        return len(self.status)
+
+    @property
+    def seq(self):
+        """Şimdiye kadarki değişiklik sayısı."""
+        return len(self._log)
+
+    @property
+    def current(self):
+        """Mevcut hedefin indeksi; bekleyen iş kalmadıysa None."""
+        return self.cursor if self.cursor < len(self.status) else None
+
+    @property
+    def all_done(self):
+        return self.counts[JOB_PENDING] == 0
+
+    def mark(self, index, status):
+        """
+        Sets the status of one job and keeps the cursor and counters in step.
+
+        Args:
+            index (int): Job index.
+            status (int): JOB_PENDING, JOB_DONE or JOB_SKIPPED.
+        """
+        old = int(self.status[index])
+        if old == status:
+            return
+        self.status[index] = status
+        self.counts[old] -= 1
+        self.counts[status] += 1
+        self._log.append(index)
+
+        if status == JOB_PENDING:
+            self.cursor = min(self.cursor, index)
+        elif index == self.cursor:
+            # İmleç sadece ileri gider; toplam maliyet O(n), iş başına O(1)
+            n = len(self.status)
+            cursor = index + 1
+            while cursor < n and self.status[cursor] != JOB_PENDING:
+                cursor += 1
+            if cursor == n and self.counts[JOB_PENDING]:
+                # select() ile ileri atlanmıştı; geride bekleyen iş var
+                cursor = int(np.flatnonzero(self.status == JOB_PENDING)[0])
+            self.cursor = cursor
+
+    def select(self, index):
+        """Bekleyen bir işi mevcut hedef yap (ör. kazık ucuna en yakın olanı)."""
+        if self.status[index] == JOB_PENDING:
+            self.cursor = int(index)
+
+    def restore(self, status):
+        """
+        Replaces all statuses at once (e.g. from a progress journal).
+
+        Args:
+            status (np.ndarray): int8 status per job.
+        """
+        status = np.asarray(status, dtype=np.int8)
+        changed = np.flatnonzero(status != self.status)
+        self.status[:] = status
+        self.counts = {code: int(np.count_nonzero(status == code)) for code in (JOB_PENDING, JOB_DONE, JOB_SKIPPED)}
+        pending = np.flatnonzero(status == JOB_PENDING)
+        self.cursor = int(pending[0]) if len(pending) else len(status)
+        self._log.extend(changed.tolist())
+
+    def complete_current(self):
+        """Mevcut hedefi tamamlandı işaretle; indeksini (veya None) döndür."""
+        index = self.current
+        if index is not None:
+            self.mark(index, JOB_DONE)
+        return index
+
+    def skip_current(self):
+        """Mevcut hedefi atlandı işaretle; indeksini (veya None) döndür."""
+        index = self.current
+        if index is not None:
+            self.mark(index, JOB_SKIPPED)
+        return index
+
+    def changes_since(self, seq):
+        """
+        Returns the jobs whose status changed after a given point.
+
+        Args:
+            seq (int): Value of self.seq the caller saw last time.
+
+        Returns:
+            tuple: (unique changed indices as np.ndarray, current seq).
+        """
+        changed = np.unique(np.asarray(self._log[seq:], dtype=np.int64))
+        return changed, len(self._log)
+
+    def color_codes(self, index=None):
+        """Verilen (veya tüm) kazıklar için COLOR_* kodları."""
+        if index is None:
+            index = np.arange(len(self.status))
+        index = np.asarray(index, dtype=np.int64)
+        codes = (self.status[index] == JOB_DONE).astype(np.int8)
+        codes[index == self.cursor] = COLOR_CURRENT
+        return codes
@@ -0,0 +1,100 @@
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from PyQt5.QtGui import QColor, QFont
+from PyQt5.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+
+from jobState import JOB_DONE, JOB_SKIPPED
+
+JOB_TABLE_COLUMNS = ['id', 'easting', 'northing', 'altitude']
+JOB_TABLE_WIDTHS = [40, 120, 120, 120]
+JOB_ROW_HEIGHT = 25  # 20 px satır + 5 px boşluk
+# Eski RowManager renkleri: mevcut hedef sarı, tamamlanan yeşil, atlanan kırmızı
+JOB_TEXT_COLORS = {'current': QColor(229, 195, 91), JOB_DONE: QColor(0, 255, 0), JOB_SKIPPED: QColor(255, 0, 0)}
+
+
+class JobTableModel(QAbstractTableModel):
+    """
+    Kazık listesinin modeli.
+
+    Satırlar için widget oluşturulmaz; görünüm sadece ekrandaki satırlar
+    için data() çağırır. Değerler planın sütun dizilerinden, yazı rengi
+    JobState'ten okunur. sync() sadece durumu değişen satırlar için
+    dataChanged yayınlar.
+    """
+
+    def __init__(self, data, jobs, parent=None):
+        """
+        :param data: Plan DataFrame'i (id, easting, northing, altitude sütunları)
+        :param jobs: Planın JobState nesnesi
+        """
+        super(JobTableModel, self).__init__(parent)
+        self.jobs = jobs
+        self._columns = [data[name].to_numpy() for name in JOB_TABLE_COLUMNS]
+        self._font = QFont()
+        self._font.setPointSize(12)
+        self._jobs_seq = jobs.seq
+        self._cursor = jobs.cursor
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.jobs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(JOB_TABLE_COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return str(self._columns[index.column()][row])
+        if role == Qt.ForegroundRole:
+            if row == self.jobs.cursor:
+                return JOB_TEXT_COLORS['current']
+            return JOB_TEXT_COLORS.get(int(self.jobs.status[row]), QVariant())
+        if role == Qt.FontRole:
+            return self._font
+        return QVariant()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return JOB_TABLE_COLUMNS[section]
+        return QVariant()
+
+    def sync(self):
+        """JobState'te değişen satırları (ve eski/yeni hedefi) yeniden boyat."""
+        changed, self._jobs_seq = self.jobs.changes_since(self._jobs_seq)
+        rows = np.unique(np.append(changed, [self._cursor, self.jobs.cursor]))
+        self._cursor = self.jobs.cursor
+        last_column = len(JOB_TABLE_COLUMNS) - 1
+        for row in rows[rows < len(self.jobs)]:
+            self.dataChanged.emit(self.index(int(row), 0), self.index(int(row), last_column), [Qt.ForegroundRole])
+
+
+class JobTableView(QTableView):
+    """RowManager görünümündeki kazık listesi: başlıksız, sabit satır yüksekliği."""
+
+    def __init__(self, parent=None):
+        super(JobTableView, self).__init__(parent)
+        self.horizontalHeader().hide()
+        self.verticalHeader().hide()
+        self.setShowGrid(False)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setWordWrap(False)
+        self.setTextElideMode(Qt.ElideNone)
+        # Sabit satır yüksekliği: kaydırma konumu hesabı satır sayısından bağımsız
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(JOB_ROW_HEIGHT)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+    def setModel(self, model):
+        super(JobTableView, self).setModel(model)
+        for column, width in enumerate(JOB_TABLE_WIDTHS):
+            self.setColumnWidth(column, width)
+
+    def scroll_to_row(self, row):
+        """Satırı görünür yap (sadece gerekiyorsa kaydırır)."""
+        model = self.model()
+        if model is not None and row is not None and 0 <= row < model.rowCount():
+            self.scrollTo(model.index(row, 0), QAbstractItemView.EnsureVisible)
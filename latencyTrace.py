@@ -0,0 +1,162 @@
+import bisect
+import time
+
+import numpy as np
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QLabel
+
+# Bir konumun geçtiği aşamalar; zaman damgaları bu sırayla bir listede tutulur
+RECV, FRAME, PARSE, SIGNAL, RENDER, PAINT = range(6)
+STAGE_NAMES = ('recv', 'frame', 'parse', 'signal', 'render', 'paint')
+# Histogramlar: bir önceki aşamadan bu aşamaya geçen süre, 'total' recv -> paint
+TRACE_NAMES = STAGE_NAMES[1:] + ('total',)
+# 10 µs - 10 s arası logaritmik kutular (%6 genişlik), taşanlar uç kutulara
+LATENCY_BIN_EDGES = np.geomspace(1e-5, 10.0, 241)
+LATENCY_OVERLAY_HZ = 2
+
+
+def new_stamps(t_recv, t_frame=None):
+    """Soketten okunan (ve çerçevelenen) bir cümle için zaman damgası listesi."""
+    return [t_recv, t_recv if t_frame is None else t_frame, 0.0, 0.0, 0.0, 0.0]
+
+
+class LatencyHistogram:
+    """
+    Sabit boyutlu gecikme histogramı.
+
+    Örnekler saklanmaz; her değer logaritmik bir kutuya sayılır, böylece
+    bellek ve add() maliyeti örnek sayısından bağımsızdır. Yüzdelikler
+    kutunun üst sınırıyla verilir (gerçek değerden en fazla bir kutu büyük).
+    """
+
+    def __init__(self, edges=LATENCY_BIN_EDGES):
+        self.edges = edges
+        self._edges = edges.tolist()  # bisect için
+        self.counts = np.zeros(len(edges) + 1, dtype=np.int64)
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_left(self._edges, seconds)] += 1
+        self.n += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def reset(self):
+        self.counts[:] = 0
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def mean(self):
+        return self.total / self.n if self.n else 0.0
+
+    def percentile(self, q):
+        """q (0-100) yüzdeliğinin üst sınırı (s); örnek yoksa 0."""
+        if not self.n:
+            return 0.0
+        k = int(np.searchsorted(np.cumsum(self.counts), q / 100.0 * self.n))
+        return min(float(self.edges[min(k, len(self.edges) - 1)]), self.max)
+
+
+class LatencyTracer:
+    """
+    GNSS konumunun soketten ekrana kadar aşama aşama gecikmesi.
+
+    Her GnssSample kendi zaman damgası listesini taşır (time.perf_counter):
+    recv ve frame GNSS iş parçacığında, parse make_gnss_sample'da, signal
+    GUI'ye teslimde, render plot_gdf başında, paint haritaların paintEvent'i
+    bitince doldurulur. Posta kutusunda atılan veya çizilmeden yerine yenisi
+    gelen konumlar sadece o ana kadarki aşamalarda sayılır.
+    """
+
+    def __init__(self):
+        self.histograms = {name: LatencyHistogram() for name in TRACE_NAMES}
+        self.n_views = 1
+        self.started = time.perf_counter()
+        self._latest = None  # Teslim edilmiş, henüz çizilmemiş son konum
+        self._pending = None  # Çizimi süren konum
+        self._waiting = 0  # Boyanmasını beklediğimiz görünüm sayısı
+
+    def _record(self, stamps, stage):
+        self.histograms[STAGE_NAMES[stage]].add(stamps[stage] - stamps[stage - 1])
+
+    def delivered(self, stamps):
+        """Konum GUI iş parçacığına ulaştı."""
+        stamps[SIGNAL] = time.perf_counter()
+        for stage in (FRAME, PARSE, SIGNAL):
+            self._record(stamps, stage)
+        self._latest = stamps
+
+    def render_started(self, n_views=None):
+        """plot_gdf başladı; son teslim edilen konum n_views görünümde çiziliyor."""
+        if self._latest is None:
+            return  # Joystick vb. GNSS dışı yeniden çizim
+        stamps, self._latest = self._latest, None
+        stamps[RENDER] = time.perf_counter()
+        self._record(stamps, RENDER)
+        self._waiting = self.n_views if n_views is None else n_views
+        self._pending = stamps if self._waiting > 0 else None  # Görünür harita yoksa boyama beklenmez
+
+    def painted(self):
+        """Bir harita görünümü boyamayı bitirdi."""
+        if self._pending is None:
+            return
+        self._waiting -= 1
+        if self._waiting > 0:
+            return
+        stamps, self._pending = self._pending, None
+        stamps[PAINT] = time.perf_counter()
+        self._record(stamps, PAINT)
+        self.histograms['total'].add(stamps[PAINT] - stamps[RECV])
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.started = time.perf_counter()
+
+    def summary(self):
+        """Kaplama için tek satır: uçtan uca p50/p99/en büyük."""
+        total = self.histograms['total']
+        if not total.n:
+            return "GNSS→ekran: veri yok"
+        return (f"GNSS→ekran p50 {total.percentile(50) * 1000:.0f} ms, p99 {total.percentile(99) * 1000:.0f} ms, "
+                f"en çok {total.max * 1000:.0f} ms")
+
+    def report(self):
+        """Tüm aşamalar için metin tablo (ms)."""
+        lines = [f"Gecikme raporu ({time.perf_counter() - self.started:.0f} s)",
+                 f"{'aşama':8s} {'n':>8s} {'ort':>8s} {'p50':>8s} {'p90':>8s} {'p99':>8s} {'en çok':>8s}"]
+        for name in TRACE_NAMES:
+            h = self.histograms[name]
+            lines.append(f"{name:8s} {h.n:8d} {h.mean * 1000:8.2f} {h.percentile(50) * 1000:8.2f} "
+                         f"{h.percentile(90) * 1000:8.2f} {h.percentile(99) * 1000:8.2f} {h.max * 1000:8.2f}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.report() + "\n")
+
+
+class LatencyOverlay(QLabel):
+    """Harita köşesinde uçtan uca gecikme özeti; kendi zamanlayıcısıyla yenilenir."""
+
+    def __init__(self, tracer, parent=None, rate_hz=LATENCY_OVERLAY_HZ):
+        super(LatencyOverlay, self).__init__(parent)
+        self.tracer = tracer
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 140); color: white; padding: 2px 4px;")
+        self.move(4, 4)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(int(1000 / rate_hz))
+        self.refresh()
+
+    def refresh(self):
+        text = self.tracer.summary()
+        if text != self.text():
+            self.setText(text)
+            self.adjustSize()
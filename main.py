@@ -1,17 +1,33 @@
-import sys, threading, socket, time, math, serial
+import sys, threading, time, math, serial, asyncio
 import geopandas as gpd
 from shapely.geometry import Point
 from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QFileDialog, QMessageBox
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import matplotlib.pyplot as plt
 from matplotlib.patches import Polygon, Rectangle
+from matplotlib.collections import EllipseCollection
+from matplotlib.colors import to_rgba, to_rgba_array
 import numpy as np
 from PyQt5.QtCore import QTimer, pyqtSlot, QMutex, QMutexLocker, pyqtSignal
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QScrollArea
-from PyQt5.QtGui import QPainter, QPen, QBrush, QPalette, QColor
-from PyQt5.QtCore import QThread, Qt, QPointF
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QScrollArea, QShortcut
+from PyQt5.QtGui import QPainter, QPen, QBrush, QPalette, QColor, QKeySequence
+from PyQt5.QtCore import QThread, Qt, QPointF, QObject
 from uiMain import Ui_MainWindow  # Assuming uiMain.py is in the same directory
 import pandas as pd
+from gnssStream import GpchcFramer, LatestMailbox, parse_gpchc_fix
+from gnssLog import load_replay
+from deviceLoop import DeviceLoop, AsyncSerial, TcpLink, tcp_stream
+from modbusRtu import ModbusRtuClient, ModbusError, SampleRing, max_poll_rate, poll, read_registers_response_len
+from latencyTrace import LatencyTracer, LatencyOverlay, new_stamps, PARSE, RECV
+from collections import namedtuple
+from c3dReader import load_c3d
+from navigation import (GridIndex, LocalFrame, PosePredictor, get_scaled_vehicle_coords, TOLERANCE, MAIN_VIEW_HALF_SIZE, INDEX_CELL_SIZE,
+                        PILE_COLOR_CURRENT, PILE_COLOR_DONE, PILE_COLOR_OTHER)
+from mapView import MapView, ZoomView
+from jobState import JobState, JOB_DONE, JOB_PENDING, JOB_SKIPPED
+from progressJournal import ProgressJournal, JOURNAL_FSYNC_INTERVAL
+from jobTable import JobTableModel, JobTableView
+from routeOrder import optimize_plan_order, format_route_report
 # pyuic5 ui/ui_RV24005.ui -o uiMain.py
 # b'$GPCHC,2342,210026.10,0.00,0.44,-0.13,0.35,-0.05,0.02,0.0023,0.0078,1.0002,0.00000000,0.00000000,0.00,0.000,0.000,0.000,0.000,4,0,00,0,0002*64\r\n'
 # b'$GPCHC,2342,210026.15,0.00,0.43,-0.24,0.33,-0.04,0.02,0.0037,0.0075,0.9999,0.00000000,0.00000000,0.00,0.000,0.000,0.000,0.000,4,0,00,0,0002*6E\r\n$GPCHC,2342,210026.20,0.00,0.45,-0.16,0.33,-0.00,0.03,0.0029,0.0075,1.0000,0.00000000,0.00000000,0.00,0.000,0.000,0.000,0.000,4,0,00,0,0002*64\r\n'
@@ -21,91 +37,28 @@ import pandas as pd
 # res_lock = threading.Lock()
 
 flDebugMode = True
-# Global tolerance value
-TOLERANCE = 0.1 / 111320  # 10 cm tolerans
-
-def parse_c3d_file_to_dataframe(file_path):
-    # Initialize a dictionary to store the data
-    data = {
-        'id': [],
-        'northing': [],
-        'easting': [],
-        'altitude': [],
-        'ground_altitude': [],
-        'yaw': [],
-        'object_type': []
-    }
-
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-    
-    # Skip the metadata lines and find the start of the data
-    data_start_index = 0
-    for i, line in enumerate(lines):
-        if line.strip() and line[0].isdigit():
-            data_start_index = i
-            break
-    
-    # Loop through each line in the C3D file starting from the data section
-    for line in lines[data_start_index:]:
-        line = line.strip()
-        
-        # Split the line into components
-        parts = line.split()
-        
-        # Extract relevant parts and add to the data dictionary
-        try:
-            data['id'].append(parts[0])                # id
-            data['northing'].append(float(parts[1]))   # northing (latitude)
-            data['easting'].append(float(parts[2]))    # easting (longitude)
-            data['altitude'].append(float(parts[3]))   # altitude
-            data['ground_altitude'].append(float(parts[4]))  # ground altitude
-            data['yaw'].append(float(parts[5]))        # yaw
-            data['object_type'].append('HEA160-3.3')   # Assuming all rows have this object type
-        except (IndexError, ValueError):
-            # Skip invalid lines
-            continue
-    df = pd.DataFrame(data)
-    return df
-
-def get_scaled_vehicle_coords(x, y, heading, vehicle_length=3004.71/1000, vehicle_width=880.97/1000, stake_offset=1297.53/1000):
-    """Aracı temsil eden döndürülmüş şeklin koordinatlarını döndür."""
-    latitude_scale = 1 / 111320  # Enlem başına metre
-    longitude_scale = 1 / (111320 * np.cos(np.radians(y)))  # Boylam başına metre
-
-    # Kare ve paletlerin yerel koordinatları
-    local_coords = [
-        (0, vehicle_length * latitude_scale / 2),  # Üst nokta (yuvarlanmış uç)
-        (-vehicle_width * longitude_scale / 2, -vehicle_length * latitude_scale / 2),  # Sol alt
-        (vehicle_width * longitude_scale / 2, -vehicle_length * latitude_scale / 2),   # Sağ alt
-        (vehicle_width * longitude_scale / 2, vehicle_length * latitude_scale / 2),    # Sağ üst
-        (-vehicle_width * longitude_scale / 2, vehicle_length * latitude_scale / 2)    # Sol üst
-    ]
-
-    # Kazık çakma noktasının yerel koordinatları
-    stake_coords = [
-        (-stake_offset * longitude_scale, 0)  # Kazık çakma noktası
-    ]
-
-    # Dönüş matrisi kullanarak döndür
-    rotated_coords = [
-        (
-            x + (math.cos(heading) * vx - math.sin(heading) * vy),
-            y + (math.sin(heading) * vx + math.cos(heading) * vy)
-        )
-        for vx, vy in local_coords
-    ]
-
-    # Kazık çakma noktasını döndür
-    rotated_stake_coords = [
-        (
-            x + (math.cos(heading) * vx - math.sin(heading) * vy),
-            y + (math.sin(heading) * vx + math.cos(heading) * vy)
-        )
-        for vx, vy in stake_coords
-    ]
+flNativeMapView = False  # True: matplotlib yerine QPainter tabanlı harita
+MAX_FPS = 60  # Harita yeniden çizim üst sınırı (kare/sn)
+TELEMETRY_HZ = 5  # Telemetri paneli yenileme hızı (0: her konumda)
+flOptimizeRoute = True  # Proje açılırken kazık sırasını sürüş mesafesine göre optimize et
+# True: iş bitince/atlanınca sıradaki yerine kazık ucuna en yakın bekleyen kazığa geç. Optimize
+# rota açgözlü en yakın komşudan kısa olduğu için varsayılan sıra takibi; rota kapalıyken veya
+# operatör sıradan saptığında işe yarar
+flNearestNextJob = False
+flLatencyOverlay = True  # Haritada GNSS→ekran gecikme özeti (F12: ayrıntılı rapor)
+flDeadReckoning = True  # GNSS konumları arasında aracı Ve/Vn/gyro z ile ileri tahmin edip MAX_FPS'te çiz
+GNSS_HOST = "192.168.1.203"  # GPCHC alıcısı (test için gnssEmulator.py: 127.0.0.1)
+GNSS_PORT = 9904
+GNSS_RECV_TIMEOUT = 5.0  # Bu kadar veri gelmezse bağlantı kopmuş say (s)
+GNSS_RECONNECT_DELAY = 1.0  # Yeniden bağlanma denemeleri arası (s)
+SENSOR_POLL_HZ = 50  # Mesafe sensörü yoklama hızı (9600 baud'da tek register için üst sınır ~50 Hz)
+# Boş değilse alıcı yerine bu GPCHC logları oynatılır (dosya, dosya listesi veya klasör)
+REPLAY_LOGS = []
+REPLAY_SPEED = 1.0  # 1: gerçek zaman, N: N kat hızlı, 0: bekleme olmadan en yüksek hız
+REPLAY_TIME_BASE = 'gps'  # 'gps': cümledeki GPSTime, 'log': log satırının zaman damgası
+# JobState renk kodu (diğer, tamamlanan, mevcut) -> RGBA
+PILE_PALETTE = np.array([to_rgba(PILE_COLOR_OTHER), to_rgba(PILE_COLOR_DONE), to_rgba(PILE_COLOR_CURRENT)])
 
-    return rotated_coords, rotated_stake_coords
 class Joystick(QWidget):
     joystick_moved = pyqtSignal(float, float)  # Sinyal: X ve Y eksenindeki hareket
 
@@ -173,6 +126,147 @@ class Joystick(QWidget):
         """Joystick'in hareket sinyalini sürekli yayımlar."""
         if self.current_x != 0 or self.current_y != 0:
             self.joystick_moved.emit(self.current_x, self.current_y)
+# GNSS iş parçacığında hazırlanan, GUI'ye posta kutusuyla iletilen konum
+# position yerel metrik çerçevededir; çerçeve yoksa None
+GnssSample = namedtuple('GnssSample', ['fix', 'status', 'heading', 'position', 'stamps'])
+
+def make_gnss_sample(sentence, fn, frame=None, stamps=None):
+    """Cümleyi ayrıştır, durumu yorumla ve konumu yerel çerçeveye izdüşür (GUI dışında çalışabilir)."""
+    if stamps is None:
+        stamps = new_stamps(time.perf_counter())
+    fix = parse_gpchc_fix(sentence)
+    status = fn.interpret_status(fix.status_dict())
+    # GPCHC heading: kuzeyden saat yönünde derece; harita: saat yönü tersine radyan
+    heading = -math.radians(fix.heading)
+    position = None
+    if frame is not None and (fix.latitude != 0 or fix.longitude != 0):
+        position = frame.forward(fix.longitude, fix.latitude)
+    stamps[PARSE] = time.perf_counter()
+    return GnssSample(fix, status, heading, position, stamps)
+
+class RedrawScheduler(QObject):
+    """
+    Kirli bayrak ile yeniden çizim zamanlayıcısı.
+
+    request() sadece çizimi kirli işaretler; art arda gelen istekler tek
+    bir kareye birleştirilir ve kareler arasında en az 1/max_fps saniye
+    bırakılır. Hiçbir şey değişmezse hiç çizim yapılmaz.
+    """
+    def __init__(self, callback, max_fps=MAX_FPS, parent=None):
+        super(RedrawScheduler, self).__init__(parent)
+        self.callback = callback
+        self.dirty = False
+        self.requests = 0  # Toplam istek sayısı
+        self.frames = 0  # Gerçekten çizilen kare sayısı
+        self._last_frame = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._flush)
+        self.set_max_fps(max_fps)
+
+    def set_max_fps(self, max_fps):
+        """Kare sınırını değiştir (0 veya negatif: sınırsız)."""
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+
+    def request(self):
+        self.requests += 1
+        if self.dirty:
+            return  # Zaten bir kare planlandı
+        self.dirty = True
+        wait = self._last_frame + self.min_interval - time.perf_counter()
+        self._timer.start(max(0, int(wait * 1000 + 0.5)))
+
+    def stop(self):
+        self._timer.stop()
+        self.dirty = False
+
+    def _flush(self):
+        self.dirty = False
+        self._last_frame = time.perf_counter()
+        self.frames += 1
+        self.callback()
+
+class TelemetryPanel(QObject):
+    """
+    Etiket güncelleme katmanı.
+
+    Her etiket için son yazılan metin saklanır; setText sadece metin
+    değiştiğinde çağrılır. push() ile gelen konumlar saklanır ve panel
+    rate_hz hızında tek seferde biçimlendirilip yazılır; navigasyon tam
+    konum hızında çalışmaya devam eder. Örnekten gelmeyen değerler (ör.
+    çizimde hesaplanan kazık ucu) post() ile bırakılır ve aynı hızda yazılır.
+    """
+    def __init__(self, fields, rate_hz=TELEMETRY_HZ, parent=None):
+        """
+        :param fields: (QLabel, biçimlendirici) listesi; biçimlendirici örneği metne çevirir
+        :param rate_hz: Panel yenileme hızı; 0 veya negatifse her push'ta yazılır
+        """
+        super(TelemetryPanel, self).__init__(parent)
+        self.fields = fields
+        self._shown = {}  # QLabel -> son yazılan metin
+        self._latest = None
+        self._posted = {}  # QLabel -> bir sonraki flush'ta yazılacak metin
+        self.n_set_text = 0  # Gerçekten yapılan setText sayısı
+        self.n_unchanged = 0  # Metin aynı olduğu için atlananlar
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.flush)
+        self.set_rate(rate_hz)
+
+    def set_rate(self, rate_hz):
+        self.rate_hz = rate_hz
+        if rate_hz > 0:
+            self._timer.start(int(1000 / rate_hz))
+        else:
+            self._timer.stop()
+
+    def push(self, sample):
+        """En yeni örneği sakla (sık çağrılabilir)."""
+        self._latest = sample
+        if self.rate_hz <= 0:
+            self.flush()
+
+    def post(self, label, text):
+        """Etiketin en yeni metnini sakla; panel hızında yazılır (sık çağrılabilir)."""
+        self._posted[label] = text
+        if self.rate_hz <= 0:
+            self.flush()
+
+    def flush(self):
+        posted, self._posted = self._posted, {}
+        for label, text in posted.items():
+            self.set_text(label, text)
+        sample, self._latest = self._latest, None
+        if sample is None:
+            return
+        for label, fmt in self.fields:
+            self.set_text(label, fmt(sample))
+
+    def set_text(self, label, text):
+        """Metin değiştiyse etikete yaz."""
+        if self._shown.get(label) == text:
+            self.n_unchanged += 1
+            return
+        self._shown[label] = text
+        label.setText(text)
+        self.n_set_text += 1
+
+    def clear_label(self, label):
+        self._posted.pop(label, None)
+        self._shown[label] = ''
+        label.clear()
+
+class RouteWorker(QThread):
+    """Kazık sırası optimizasyonu (ROUTE_MAX_SECONDS'e kadar sürer); GUI'yi bloklamasın diye ayrı iş parçacığında."""
+    sgDone = pyqtSignal(object, object)  # (satır sırası, RouteReport)
+
+    def __init__(self, data, parent=None):
+        super(RouteWorker, self).__init__(parent)
+        self.data = data
+
+    def run(self):
+        self.sgDone.emit(*optimize_plan_order(self.data))
+
+
 class MainApp(QMainWindow, Ui_MainWindow):
     def __init__(self, parent=None):
         super(MainApp, self).__init__(parent)
@@ -183,11 +277,56 @@ class MainApp(QMainWindow, Ui_MainWindow):
         self.zoomScale = 5.0
         self.fn = externalFunctions()
         self.data = None
+        self.route_worker = None  # Proje açılırken çalışan RouteWorker
+        self.jobs = None  # Proje açılınca JobState
+        self.redraw = None  # Proje açılınca RedrawScheduler
+        # GNSS soketi ve seri port tek asyncio döngüsünde (tek iş parçacığı)
+        self.devices = DeviceLoop()
+        self.serial_thread = None  # SensorDevice
+        self.gnss_thread = None  # GnssDevice veya GNSS_Replay; varsa araç GNSS konumunu izler
+        self.frame = None  # Proje açılınca plan merkezli LocalFrame
+        self.telemetry = TelemetryPanel([
+            (self.lbOrient_h, lambda s: f"{s.fix.heading:.2f}°"),
+            (self.lbOrient_p, lambda s: f"{s.fix.pitch:.2f}°"),
+            (self.lbOrient_r, lambda s: f"{s.fix.roll:.2f}°"),
+            (self.lbGyro_X, lambda s: f"{s.fix.gyro_x:.2f}°/s"),
+            (self.lbGyro_Y, lambda s: f"{s.fix.gyro_y:.2f}°/s"),
+            (self.lbGyro_Z, lambda s: f"{s.fix.gyro_z:.2f}°/s"),
+            (self.lbAcc_X, lambda s: f"{s.fix.acc_x:.4f} m/s²"),
+            (self.lbAcc_Y, lambda s: f"{s.fix.acc_y:.4f} m/s²"),
+            (self.lbAcc_Z, lambda s: f"{s.fix.acc_z:.4f} m/s²"),
+            (self.lbActualPos_Z, lambda s: f"{s.fix.altitude:.2f} m"),
+            (self.lbVelocity_e, lambda s: f"{s.fix.ve:.3f} m/s"),
+            (self.lbVelocity_n, lambda s: f"{s.fix.vn:.3f} m/s"),
+            (self.lbVelocity_u, lambda s: f"{s.fix.vu:.3f} m/s"),
+            (self.lbNSV_1, lambda s: f"{s.fix.nsv1}"),
+            (self.lbNSV_2, lambda s: f"{s.fix.nsv2}"),
+            (self.lbSystemState, lambda s: f"{s.status['System State Description']}"),
+            (self.lbSatelliteState, lambda s: f"{s.status['Satellite State Description']}"),
+        ], TELEMETRY_HZ, self)
         self.slZoomScale.valueChanged.connect(self.slChange_Scale)
         self.pbOpen.clicked.connect(self.fnOpenFile)
         self.pushButton_2.setEnabled(False)
         self.pushButton_2.clicked.connect(self.complete_job)
         self.pushButton_3.clicked.connect(self.reset_job)  # pushButton_3'ü reset_job fonksiyonuna bağla
+        # Kazık listesi: scrollArea yerine sanal tablo (sadece görünen satırlar çizilir)
+        self.job_model = None
+        self.job_view = JobTableView(self.frame_5)
+        self.job_view.setGeometry(self.scrollArea.geometry())
+        self.scrollArea.hide()
+        # İş ilerleme günlüğü; fsync en fazla JOURNAL_FSYNC_INTERVAL gecikir
+        self.journal = None
+        self.journal_timer = QTimer(self)
+        self.journal_timer.timeout.connect(self.sync_journal)
+        # GNSS konumunun soketten ekrana gecikmesi
+        self.latency = LatencyTracer()
+        self.latency_overlay = None
+        QShortcut(QKeySequence(Qt.Key_F12), self).activated.connect(self.dump_latency_report)
+        # Konumlar arasında ölü hesap; araç hareket ettikçe MAX_FPS'te yeniden çiz
+        self.predictor = PosePredictor()
+        self.predict_timer = QTimer(self)
+        self.predict_timer.setInterval(int(1000 / MAX_FPS))
+        self.predict_timer.timeout.connect(self.on_predict_tick)
 
         if flDebugMode: self.parse_gnss_data(self.msGNSS)
 
@@ -198,112 +337,169 @@ class MainApp(QMainWindow, Ui_MainWindow):
 
     def clear_project_details(self):
         """Mevcut proje detaylarını siler."""
+        # Zamanlayıcıyı bırak: redraw None iken GNSS, joystick ve tahmin yeniden çizim istemez
+        self.redraw.stop()
+        self.redraw.deleteLater()
+        self.redraw = None
         self.data = None
         self.gdf = None
-        self.completedJobs = []
-        self.row_manager = None
-        self.main_canvas.ax.clear()
-        self.zoom_canvas.ax.clear()
-        self.main_canvas.draw()
-        self.zoom_canvas.draw()
-        self.lbActualPos_X.clear()
-        self.lbActualPos_Y.clear()
-        self.lbTargetPos_X.clear()
-        self.lbTargetPos_Y.clear()
-        self.lbTargetPos_Z.clear()
-        self.lbSensor.clear()
-
-    @pyqtSlot(str)
+        self.spatial_index = None
+        self.jobs = None
+        self.job_model = None
+        self.job_view.setModel(None)
+        self.journal_timer.stop()
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        self.predict_timer.stop()
+        self.predictor.reset()
+        self.main_canvas.clear_plan()
+        self.zoom_canvas.clear_plan()
+        for label in (self.lbActualPos_X, self.lbActualPos_Y, self.lbTargetPos_X, self.lbTargetPos_Y, self.lbTargetPos_Z, self.lbSensor):
+            self.telemetry.clear_label(label)
+
+    @pyqtSlot(bytes)
     def parse_gnss_data(self, data):
-        self.dGNSS = self.fn.parse_gpchc_message(data)
-        self.dStatus = self.fn.interpret_status(self.dGNSS['Status'])
-        self.lbOrient_h.setText(f"{self.dGNSS['Heading']}°")
-        self.lbOrient_p.setText(f"{self.dGNSS['Pitch']}°")
-        self.lbOrient_r.setText(f"{self.dGNSS['Roll']}°")
-        self.lbGyro_X.setText(f"{self.dGNSS['gyro x']}°/s")
-        self.lbGyro_Y.setText(f"{self.dGNSS['gyro y']}°/s")
-        self.lbGyro_Z.setText(f"{self.dGNSS['gyro z']}°/s")
-        self.lbAcc_X.setText(f"{self.dGNSS['acc x']} m/s²")
-        self.lbAcc_Y.setText(f"{self.dGNSS['acc y']} m/s²")
-        self.lbAcc_Z.setText(f"{self.dGNSS['acc z']} m/s²")
-        self.lbActualPos_X.setText(f"{self.dGNSS['Latitude']}")
-        self.lbActualPos_Y.setText(f"{self.dGNSS['Longitude']}")
-        self.lbActualPos_Z.setText(f"{self.dGNSS['Altitude']} m")
-        self.lbVelocity_e.setText(f"{self.dGNSS['Ve']} m/s")
-        self.lbVelocity_n.setText(f"{self.dGNSS['Vn']} m/s")
-        self.lbVelocity_u.setText(f"{self.dGNSS['Vu']} m/s")
-        self.lbNSV_1.setText(f"{self.dGNSS['NSV1']}")
-        self.lbNSV_2.setText(f"{self.dGNSS['NSV2']}")
-        self.lbSystemState.setText(f"{self.dStatus['System State Description']}")
-        self.lbSatelliteState.setText(f"{self.dStatus['Satellite State Description']}")
+        """Tek cümleyi GUI iş parçacığında işle (debug modu)."""
+        self.show_gnss_sample(make_gnss_sample(data, self.fn, self.frame))
+
+    @pyqtSlot()
+    def on_gnss_fix(self):
+        """GNSS iş parçacığının posta kutusundaki en yeni konumu al."""
+        sample = self.gnss_thread.mailbox.take()
+        if sample is not None:
+            self.show_gnss_sample(sample)
+
+    def show_gnss_sample(self, sample):
+        self.dGNSS = sample.fix
+        self.dStatus = sample.status
+        self.latency.delivered(sample.stamps)
+        self.telemetry.push(sample)  # Panel kendi hızında yenilenir
+        if self.redraw is not None:
+            if self.gnss_thread is not None and sample.position is not None:
+                with QMutexLocker(self.mutex):
+                    self.vehicle_position = Point(sample.position)
+                    self.main_canvas.heading = sample.heading
+                if flDeadReckoning:
+                    fix = sample.fix
+                    self.predictor.update(sample.stamps[RECV], *sample.position, sample.heading, fix.ve, fix.vn, fix.gyro_z)
+                    if not self.predict_timer.isActive():
+                        self.predict_timer.start()
+            self.redraw.request()  # Yeni konum: haritayı yeniden çiz
+
+    def on_predict_tick(self):
+        """Araç hareket ediyorsa tahmini pozu çizmek için kare iste; durunca zamanlayıcıyı durdur."""
+        if self.redraw is not None and self.predictor.moving(time.perf_counter()):
+            self.redraw.request()
+        else:
+            self.predict_timer.stop()  # Sonraki GNSS konumu yeniden başlatır
+
+    def display_pose(self):
+        """Karenin ekrana basılacağı andaki tahmini poz; ölü hesap kapalıysa None."""
+        if not flDeadReckoning or self.gnss_thread is None:
+            return None
+        # Çizimden boyamaya ölçülen gecikme kadar ileriye tahmin et
+        return self.predictor.predict(time.perf_counter() + self.latency.histograms['paint'].percentile(50))
 
     def plot_gdf(self):
         "GeoDataFrame ve araç pozisyonunu grMain ve grZoom'da çiz."
+        if self.jobs is None:
+            return  # Proje kapatıldı
+        # Kare, ekranda görünen haritalar boyanınca tamamlanmış sayılır
+        self.latency.render_started(sum(not canvas.visibleRegion().isEmpty() for canvas in (self.main_canvas, self.zoom_canvas)))
         with QMutexLocker(self.mutex):
-            self.main_canvas.plot(self.gdf, self.vehicle_position, self.zoomScale, self.completedJobs)
-            self.zoom_canvas.plot(self.gdf, self.vehicle_position, self.main_canvas.heading, self.zoomScale, self.completedJobs)
+            # Tolerans kararı gerçek konumla, çizim tahmini pozla
+            display_pose = self.display_pose()
+            self.main_canvas.plot(self.gdf, self.vehicle_position, self.zoomScale, self.jobs, self.spatial_index, display_pose)
+            self.zoom_canvas.plot(self.gdf, self.vehicle_position, self.main_canvas.heading, self.zoomScale, self.jobs,
+                                  display_pose)
 
-            # Kazık çakma noktasının mevcut oryantasyonunu lbActualPos_X ve lbActualPos_Y etiketlerine yaz
+            # Kazık çakma noktası (aracın gerçek konumundan) ve mevcut hedef; panel TELEMETRY_HZ'de yazar
             _, stake_coords = get_scaled_vehicle_coords(self.vehicle_position.x, self.vehicle_position.y, self.main_canvas.heading)
-            stake_x, stake_y = stake_coords[0]
-            self.lbActualPos_X.setText(f"{stake_x:.8f}")
-            self.lbActualPos_Y.setText(f"{stake_y:.8f}")
-
-            # Mevcut hedef noktayı lbTargetPos_X, lbTargetPos_Y, lbTargetPos_Z etiketlerine yaz
-            for i in range(len(self.completedJobs)):
-                if self.completedJobs[i] == 0:
-                    target_point = self.gdf.geometry[i]
-                    self.lbTargetPos_X.setText(f"{target_point.x:.8f}")
-                    self.lbTargetPos_Y.setText(f"{target_point.y:.8f}")
-                    self.lbTargetPos_Z.setText(f"{self.data['altitude'][i]:.4f}")
-                    break
+            stake_lon, stake_lat = self.frame.inverse(*stake_coords[0])
+            self.telemetry.post(self.lbActualPos_X, f"{stake_lon:.8f}")
+            self.telemetry.post(self.lbActualPos_Y, f"{stake_lat:.8f}")
+
+            i = self.jobs.current
+            if i is not None:
+                self.telemetry.post(self.lbTargetPos_X, f"{self.data['easting'][i]:.8f}")
+                self.telemetry.post(self.lbTargetPos_Y, f"{self.data['northing'][i]:.8f}")
+                self.telemetry.post(self.lbTargetPos_Z, f"{self.data['altitude'][i]:.4f}")
 
     @pyqtSlot(bool)
     def update_pushButton_2(self, enabled):
         self.pushButton_2.setEnabled(enabled)
 
     def complete_job(self):
-        for i in range(len(self.completedJobs)):
-            if self.completedJobs[i] == 0:
-                self.completedJobs[i] = 1
-                self.row_manager.update(i, 'g')
-                self.pushButton_2.setEnabled(False)
-                break
-        if i < len(self.completedJobs) - 1: self.row_manager.update(i+1,'y')
+        if self.jobs is None:
+            return
+        i = self.jobs.complete_current()
+        if i is not None:
+            self.journal.append(self.plan_rows[i], JOB_DONE)
+            self.pushButton_2.setEnabled(False)
+            if flNearestNextJob:
+                self.select_nearest_job()
+        self.updateJobs()
         self.check_all_jobs_completed()
+        self.redraw.request()
 
     def reset_job(self):
-        for i in range(len(self.completedJobs)):
-            if self.completedJobs[i] == 0:
-                self.completedJobs[i] = -1
-                self.row_manager.update(i, 'r')
-                self.pushButton_2.setEnabled(False)
-                break
-        if i < len(self.completedJobs) - 1: self.row_manager.update(i+1,'y')
+        if self.jobs is None:
+            return
+        i = self.jobs.skip_current()
+        if i is not None:
+            self.journal.append(self.plan_rows[i], JOB_SKIPPED)
+            self.pushButton_2.setEnabled(False)
+            if flNearestNextJob:
+                self.select_nearest_job()
+        self.updateJobs()
         self.check_all_jobs_completed()
+        self.redraw.request()
+
+    def select_nearest_job(self):
+        """Kazık ucuna en yakın bekleyen kazığı mevcut hedef yap (uzamsal indeksle)."""
+        if self.jobs.all_done:
+            return
+        with QMutexLocker(self.mutex):
+            _, stake_coords = get_scaled_vehicle_coords(self.vehicle_position.x, self.vehicle_position.y,
+                                                        self.main_canvas.heading)
+        i = self.spatial_index.nearest(*stake_coords[0], mask=self.jobs.status == JOB_PENDING)
+        if i >= 0:
+            self.jobs.select(i)
 
     def check_all_jobs_completed(self):
-        if all(job != 0 for job in self.completedJobs):
+        if self.jobs.all_done:
             self.wdMainScreen.setCurrentWidget(self.wdSummary)
 
     def startProject(self):
-        # UTM easting ve northing'e göre geometri oluştur
-        geometry = [Point(xy) for xy in zip(self.data['easting'], self.data['northing'])]
-        self.gdf = gpd.GeoDataFrame(self.data, geometry=geometry)
-
-        # CRS'yi UTM Zone 30N (EPSG:32630) olarak ayarla
-        self.gdf.set_crs(epsg=32630, inplace=True)
+        # Plan boylam/enlem (easting/northing sütunları) olarak gelir; tüm planı
+        # bir kez plan merkezli yerel metrik çerçeveye izdüşür
+        lon = self.data['easting'].to_numpy(dtype=np.float64)
+        lat = self.data['northing'].to_numpy(dtype=np.float64)
+        self.frame = LocalFrame.from_points(lon, lat)
+        x, y = self.frame.forward(lon, lat)
+        self.gdf = gpd.GeoDataFrame(self.data, geometry=gpd.points_from_xy(x, y), crs=self.frame.crs)
+        # Görünür alan / tolerans sorguları için uzamsal indeks (bir kez kurulur)
+        self.spatial_index = GridIndex(x, y, INDEX_CELL_SIZE)
         
         # grMain ve grZoom için layout oluştur
         self.main_layout = QVBoxLayout(self.grMain)
         self.zoom_layout = QVBoxLayout(self.grZoom)
-        # grMain ve grZoom için matplotlib canvas oluştur
-        self.main_canvas = MatplotlibCanvas(self)
-        self.zoom_canvas = ZoomCanvas(self)
+        # grMain ve grZoom için matplotlib canvas (veya QPainter görünümü) oluştur
+        if flNativeMapView:
+            self.main_canvas = MapView(self)
+            self.zoom_canvas = ZoomView(self)
+        else:
+            self.main_canvas = MatplotlibCanvas(self)
+            self.zoom_canvas = ZoomCanvas(self)
 
         # Canvas'ları layout'lara ekle
         self.main_layout.addWidget(self.main_canvas)
         self.zoom_layout.addWidget(self.zoom_canvas)
+        self.main_canvas.painted.connect(self.latency.painted)
+        self.zoom_canvas.painted.connect(self.latency.painted)
+        if flLatencyOverlay:
+            self.latency_overlay = LatencyOverlay(self.latency, self.main_canvas)
 
         self.joystick = Joystick(self)
         self.joystick_layout = QVBoxLayout(self.wdJoystick)
@@ -314,18 +510,26 @@ class MainApp(QMainWindow, Ui_MainWindow):
         self.joystick.joystick_moved.connect(self.update_info)
 
         # Başlangıç aracı pozisyonu
-        self.vehicle_position = Point(35.38464100, 38.69935827)
+        self.vehicle_position = Point(self.frame.forward(35.38464100, 38.69935827))
         # self.vehicle_position = Point(self.dGNSS['Longitude'], self.dGNSS['Latitude'])
         self.mutex = QMutex()  # UI ve threading arasında veri güvenliği
-        self.ui_update_timer = QTimer(self)
-        self.ui_update_timer.timeout.connect(self.plot_gdf)
-        self.ui_update_timer.start(20)  # 50 ms'de bir UI güncellemesi
+        # Sabit zamanlayıcı yerine sadece bir şey değişince çiz
+        self.redraw = RedrawScheduler(self.plot_gdf, MAX_FPS, self)
+        self.redraw.request()
         # Start GNSS Thread
-        if not flDebugMode:
-            self.gnss_thread = GNSS_Threading("192.168.1.203", 9904)
-            self.gnss_thread.sgGNSS.connect(self.parse_gnss_data)
+        if self.gnss_thread is not None:
+            self.gnss_thread.frame = self.frame  # Yeni proje: yeni yerel çerçeve
+        elif REPLAY_LOGS:
+            self.gnss_thread = GNSS_Replay(REPLAY_LOGS, REPLAY_SPEED, REPLAY_TIME_BASE, self.frame)
+            self.gnss_thread.sgFixReady.connect(self.on_gnss_fix)
+            self.gnss_thread.start()
+        elif not flDebugMode:
+            self.gnss_thread = GnssDevice(self.devices, GNSS_HOST, GNSS_PORT, self.frame, self)
+            self.gnss_thread.sgFixReady.connect(self.on_gnss_fix)
+            self.gnss_thread.sgStatus.connect(self.statusbar.showMessage)
             self.gnss_thread.start()
-            self.serial_thread = SerialThread()
+        if not flDebugMode and self.serial_thread is None:
+            self.serial_thread = SensorDevice(self.devices, parent=self)
             self.serial_thread.sensor_data_received.connect(self.update_sensor_label)
             self.serial_thread.start()
 
@@ -336,30 +540,79 @@ class MainApp(QMainWindow, Ui_MainWindow):
 
         # Start Serial Thread
 
+    def closeEvent(self, event):
+        """Cihaz görevlerini iptal et; kapanış DEVICE_SHUTDOWN_TIMEOUT ile sınırlı."""
+        if self.route_worker is not None:
+            self.route_worker.wait()  # Optimizasyon süre sınırlı, iş parçacığı çalışırken silinmesin
+        if isinstance(self.gnss_thread, GNSS_Replay):
+            self.gnss_thread.stop()
+            self.gnss_thread.wait()
+        self.devices.stop()
+        if self.journal is not None:
+            self.journal.close()
+        super(MainApp, self).closeEvent(event)
+
+    def dump_latency_report(self, path=None):
+        """Gecikme raporunu yazdır; yol verilirse dosyaya da kaydet."""
+        print(self.latency.report())
+        if path:
+            self.latency.dump(path)
+
+    def sync_journal(self):
+        if self.journal is not None:
+            self.journal.sync()
+
     @pyqtSlot(str)
     def update_sensor_label(self, data):
-        self.lbSensor.setText(data)
+        self.telemetry.set_text(self.lbSensor, data)
 
     def openFileNameDialog(self):
         options = QFileDialog.Options()
         options |= QFileDialog.DontUseNativeDialog
         fileName, _ = QFileDialog.getOpenFileName(self,"QFileDialog.getOpenFileName()", "","c3d Files (*.c3d)", options=options)
-        if fileName:
-            self.data = parse_c3d_file_to_dataframe(fileName)
-            self.row_manager = RowManager(self.scrollArea, self.wdScrollArea)
-            self.completedJobs = []
-            for i in range(len(self.data['id'])):
-                self.row_manager.add(order=self.data['id'][i], x=self.data['easting'][i], y=self.data['northing'][i], z=self.data['altitude'][i])
-                self.completedJobs.append(0)
-            self.startProject()
+        if not fileName:
+            return
+        data = load_c3d(fileName)
+        if not flOptimizeRoute:
+            if 'c3d_cache_error' in data.attrs:
+                self.statusbar.showMessage(data.attrs['c3d_cache_error'])
+            self.open_plan(fileName, data)
+            return
+        self.statusbar.showMessage(f"Rota optimize ediliyor: {len(data)} kazık...")
+        self.pbOpen.setEnabled(False)
+        self.route_worker = RouteWorker(data, self)
+        self.route_worker.sgDone.connect(lambda order, report: self.on_route_done(fileName, data, order, report))
+        self.route_worker.start()
+
+    def on_route_done(self, fileName, data, order, report):
+        self.route_worker = None
+        self.pbOpen.setEnabled(True)
+        self.route_report = report
+        message = format_route_report(report)
+        if 'c3d_cache_error' in data.attrs:
+            message += f" ({data.attrs['c3d_cache_error']})"
+        self.statusbar.showMessage(message)
+        self.open_plan(fileName, data.iloc[order].reset_index(drop=True), order)
+
+    def open_plan(self, fileName, data, plan_rows=None):
+        """
+        :param plan_rows: plan_rows[i], i. işin .c3d dosyasındaki satırı (günlük bu numarayı kullanır)
+        """
+        self.data = data
+        self.plan_rows = np.arange(len(data)) if plan_rows is None else plan_rows
+        self.jobs = JobState(len(self.data))
+        # Önceki oturumdan kalan ilerlemeyi geri yükle
+        self.journal = ProgressJournal.for_plan(fileName, len(self.data))
+        self.jobs.restore(self.journal.replay()[self.plan_rows])
+        self.journal_timer.start(int(JOURNAL_FSYNC_INTERVAL * 1000))
+        self.job_model = JobTableModel(self.data, self.jobs, self)
+        self.job_view.setModel(self.job_model)
+        self.startProject()
 
     def updateJobs(self):
-        for i in range(0, len(self.completedJobs)):
-            if (self.completedJobs[i] == 0):
-                idx = i
-                break
-        nextJob = self.row_manager.rows[idx]
-        self.row_manager.update(idx,'y')
+        """Değişen satırları yeniden boyat ve mevcut hedefi görünür yap."""
+        self.job_model.sync()
+        self.job_view.scroll_to_row(self.jobs.current)
 
     def findLastOne(self,arr):
         v = arr[::-1]
@@ -381,7 +634,7 @@ class MainApp(QMainWindow, Ui_MainWindow):
     def update_info(self, x, y):
         """Joystick'in hareket bilgisini güncelle."""
         self.info_label.setText(f"X: {x:.2f}, Y: {y:.2f}")
-        self.move_vehicle(x,y,0.000001)
+        self.move_vehicle(x,y,0.1)  # 10 cm/adım
 
     def move_vehicle(self,dx,dy,scale):
         with QMutexLocker(self.mutex):
@@ -389,13 +642,30 @@ class MainApp(QMainWindow, Ui_MainWindow):
             # Yön açısını (heading) joystick hareketine göre hesapla
             if dx != 0 or dy != 0:
                 self.main_canvas.heading = math.atan2(dy, dx)  - math.pi / 2 # atan2(y, x) yön açısını hesaplar
+        if self.redraw is not None:
+            self.redraw.request()
 
     def slChange_Scale(self):
         self.zoomScale = self.vValScale[self.sender().value()]
         self.lbScale.setText(f"{self.zoomScale:.2f} m")
-        self.plot_gdf()  # Zoom değiştiğinde grafiği yeniden çiz
+        if self.redraw is not None:
+            self.redraw.request()  # Zoom değiştiğinde grafiği yeniden çiz
+def pile_edge_colors(gdf):
+    """Kazık kenar renkleri (RGBA): .c3d'deki tip rengi, yoksa siyah. Dolgu rengi iş durumunu gösterir."""
+    if 'color' not in gdf:
+        return np.tile(to_rgba('black'), (len(gdf), 1))
+    return to_rgba_array(gdf['color'].to_numpy())
+
+
 class MatplotlibCanvas(FigureCanvas):
+    """
+    Ana harita. Sanatçılar (kazık koleksiyonu, araç, kazık ucu) bir kez
+    oluşturulur; her karede sadece renkleri/konumları güncellenir. Görünüm
+    değişmedikçe arka plan önbellekten geri yüklenir ve sadece araç ile
+    kazık ucu yeniden çizilir (blitting).
+    """
     stake_position_reached = pyqtSignal(bool)
+    painted = pyqtSignal()  # Kare ekrana basıldı (gecikme ölçümü)
 
     def __init__(self, parent=None):
         # Gerçek dünya boyutlarıyla 10x10 km kare figür oluştur
@@ -407,53 +677,26 @@ class MatplotlibCanvas(FigureCanvas):
         self.fig.patch.set_alpha(0)  # Figür arkaplanı
         self.heading = 0  # Başlangıç yönü (radyan cinsinden)
         self.flBlink = False
-        
-    def plot(self, gdf, vehicle_position, zoomScale, completedJobs):
-        """GeoDataFrame noktalarını, 1 metre çapında kırmızı daireler ve aracı (sarı üçgen) çiz."""
-        self.ax.clear()  # Önceki çizimi temizle
-        
-        for i in range(0, len(completedJobs)):
-            if (completedJobs[i] == 0):
-                idx = i
-                break
-        try: current_index = idx
-        except: current_index = len(completedJobs)
-        # GeoDataFrame noktalarını kırmızı daireler ile çiz
-        if gdf is not None:
-            for i, point in enumerate(gdf.geometry):
-                if i == current_index: selColor = '#FDD05A'
-                elif completedJobs[i] == 1: selColor = '#2E765E'
-                else: selColor = '#B24A3B'
-                self.ax.add_patch(plt.Circle((point.x, point.y), facecolor=selColor, radius=1 / 111320, edgecolor='black', linewidth=1))
-
-        # Aracı yeni şekil olarak çiz
-        vehicle_coords, stake_coords = get_scaled_vehicle_coords(vehicle_position.x, vehicle_position.y, self.heading)
-        vehicle_polygon = Polygon(vehicle_coords, closed=True, color='black')
-        self.ax.add_patch(vehicle_polygon)
-
-        # Kazık çakma noktasını çiz
-        stake_x, stake_y = stake_coords[0]
-        stake_color = 'red'
-        stake_reached = False
-        if gdf is not None:
-            for i, point in enumerate(gdf.geometry):
-                if i == current_index: 
-                    if abs(stake_x - point.x) < TOLERANCE and abs(stake_y - point.y) < TOLERANCE:
-                        stake_color = 'green'
-                        stake_reached = True
-                        break
-                    else: stake_color = 'red'
-        self.stake_position_reached.emit(stake_reached)
-        self.ax.add_patch(plt.Circle((stake_x, stake_y), facecolor=stake_color, radius=0.5 / 111320, edgecolor='black', linewidth=1))
-
-        # 5 km x 5 km alanı kare şeklinde ayarla
-        msf = 50/111320
-        self.ax.set_xlim(vehicle_position.x - msf, vehicle_position.x + msf)
-        self.ax.set_ylim(vehicle_position.y - msf, vehicle_position.y + msf)
+        # Araç görünüm merkezinden bu kadar uzaklaşınca harita yeniden ortalanır (0: her karede)
+        self.recenter_distance = 10
+
+        self._index = None
+        self._pile_colors = np.empty((0, 4))
+        self._edge_colors = np.empty((0, 4))  # Kazık tipi rengi (.c3d point_color)
+        self._visible = np.empty(0, dtype=np.int64)
+        self._jobs = None
+        self._jobs_seq = 0
+        self._current_index = None
+        self._view_center = None
+        self._background = None
+        self._full_redraw = True
+        self._paint_pending = False  # plot() sonrası boyama bekleniyor (gecikme ölçümü)
+        self._setup_axes()
+        self.mpl_connect('draw_event', self._on_draw)
+
+    def _setup_axes(self):
+        """Eksen stilini ve kalıcı sanatçıları bir kez oluştur."""
         self.ax.set_aspect('equal', 'box')  # Grafiği kare yap
-        self.ax.set_xticks(np.arange(vehicle_position.x - msf, vehicle_position.x + msf, 10/111320))
-        self.ax.set_yticks(np.arange(vehicle_position.y - msf, vehicle_position.y + msf, 10/111320))
-
         # Grid ekle ve stilini özelleştir
         self.ax.grid(
             visible=True, 
@@ -470,51 +713,158 @@ class MatplotlibCanvas(FigureCanvas):
             spine.set_edgecolor("#167D7F")
         self.ax.patch.set_alpha(0)   # Eksen arkaplanı
         self.ax.patch.set_color("#BBBBBB")
-        self.ax.set_xlabel("Easting (UTM)")
-        self.ax.set_ylabel("Northing (UTM)")
+        self.ax.set_xlabel("Easting (m)")
+        self.ax.set_ylabel("Northing (m)")
+
+        # Tüm kazıklar tek bir koleksiyon (1 m yarıçaplı daireler)
+        self.piles = EllipseCollection(2, 2, 0, units='xy', offsets=np.empty((0, 2)),
+                                       offset_transform=self.ax.transData, edgecolors='black', linewidths=1)
+        self.ax.add_collection(self.piles)
+        # Her karede değişenler: araç ve kazık ucu (animated -> blit ile çizilir)
+        self.vehicle_polygon = Polygon(np.zeros((5, 2)), closed=True, color='black', animated=True)
+        self.stake_circle = plt.Circle((0, 0), facecolor='red', radius=0.5, edgecolor='black', linewidth=1, animated=True)
+        self.ax.add_patch(self.vehicle_polygon)
+        self.ax.add_patch(self.stake_circle)
+
+    def clear_plan(self):
+        """Projeyi kapatırken kazıkları kaldır."""
+        self._index = None
+        self._jobs = None
+        self._visible = np.empty(0, dtype=np.int64)
+        self.piles.set_offsets(np.empty((0, 2)))
+        self._full_redraw = True
         self.draw()
+
+    def plot(self, gdf, vehicle_position, zoomScale, jobs, spatial_index=None, display_pose=None):
+        """
+        Kazık renklerini, aracı ve kazık ucunu güncelle; gerekiyorsa görünümü kaydır.
+        display_pose (x, y, heading) verilirse araç orada çizilir, tolerans
+        kararı yine vehicle_position ile verilir.
+        """
+        self._paint_pending = True
+        current_index = jobs.cursor
+
+        if gdf is None:
+            spatial_index = None
+        if spatial_index is not self._index or jobs is not self._jobs:
+            # Yeni plan: tüm renkleri bir kez hesapla
+            if spatial_index is not self._index:
+                self._view_center = None
+            self._index = spatial_index
+            self._jobs = jobs
+            self._jobs_seq = jobs.seq
+            self._current_index = current_index
+            self._pile_colors = PILE_PALETTE[jobs.color_codes()] if spatial_index is not None else np.empty((0, 4))
+            self._edge_colors = pile_edge_colors(gdf) if spatial_index is not None else np.empty((0, 4))
+            self.piles.set_facecolor(self._pile_colors[self._visible])
+            self.piles.set_edgecolor(self._edge_colors[self._visible])
+            self._full_redraw = True
+        elif self._index is not None and (jobs.seq != self._jobs_seq or current_index != self._current_index):
+            # Sadece durumu değişen kazıklar ile eski/yeni hedef yeniden boyanır
+            changed, self._jobs_seq = jobs.changes_since(self._jobs_seq)
+            changed = np.append(changed, [self._current_index, current_index])
+            changed = changed[changed < len(self._pile_colors)]
+            self._pile_colors[changed] = PILE_PALETTE[jobs.color_codes(changed)]
+            self._current_index = current_index
+            self.piles.set_facecolor(self._pile_colors[self._visible])
+            self._full_redraw = True
+
+        vehicle_coords, stake_coords = get_scaled_vehicle_coords(vehicle_position.x, vehicle_position.y, self.heading)
+        stake_x, stake_y = stake_coords[0]
+        stake_reached = False
+        if self._index is not None:
+            # Tolerans dairesindeki kazıklardan biri mevcut hedef mi?
+            in_tolerance = self._index.query_radius(stake_x, stake_y, TOLERANCE)
+            stake_reached = current_index in in_tolerance
+        self.stake_position_reached.emit(stake_reached)
+
+        # Aracı ve kazık çakma noktasını çiz
+        center_x, center_y = vehicle_position.x, vehicle_position.y
+        if display_pose is not None:
+            center_x, center_y = display_pose[:2]
+            vehicle_coords, stake_coords = get_scaled_vehicle_coords(*display_pose)
+        self.vehicle_polygon.set_xy(vehicle_coords)
+        self.stake_circle.set_center(stake_coords[0])
+        self.stake_circle.set_facecolor('green' if stake_reached else 'red')
+
+        if (self._view_center is None
+                or abs(center_x - self._view_center[0]) > self.recenter_distance
+                or abs(center_y - self._view_center[1]) > self.recenter_distance):
+            self._set_view(center_x, center_y)
+
+        if self._full_redraw:
+            self._full_redraw = False
+            self.draw()  # Arka plan _on_draw içinde yeniden yakalanır
+        else:
+            self._blit()
+
+    def _set_view(self, cx, cy):
+        """Görünümü (cx, cy) merkezine taşı ve görünür kazıkları seç."""
+        msf = MAIN_VIEW_HALF_SIZE
+        self._view_center = (cx, cy)
+        self.ax.set_xlim(cx - msf, cx + msf)
+        self.ax.set_ylim(cy - msf, cy + msf)
+        self.ax.set_xticks(np.arange(cx - msf, cx + msf, 10))
+        self.ax.set_yticks(np.arange(cy - msf, cy + msf, 10))
+        if self._index is not None:
+            # Kenardaki dairelerin yarısı da görünsün diye 1 m pay bırak
+            pad = 1
+            self._visible = self._index.query_box(cx - msf - pad, cy - msf - pad, cx + msf + pad, cy + msf + pad)
+        else:
+            self._visible = np.empty(0, dtype=np.int64)
+        if self._index is not None:
+            self.piles.set_offsets(np.column_stack((self._index.x[self._visible], self._index.y[self._visible])))
+        else:
+            self.piles.set_offsets(np.empty((0, 2)))
+        self.piles.set_facecolor(self._pile_colors[self._visible])
+        self.piles.set_edgecolor(self._edge_colors[self._visible])
+        self._full_redraw = True
+
+    def _on_draw(self, event):
+        """Tam çizimden sonra statik arka planı sakla ve hareketli sanatçıları üstüne çiz."""
+        self._background = self.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        self.ax.draw_artist(self.vehicle_polygon)
+        self.ax.draw_artist(self.stake_circle)
+
+    def _blit(self):
+        if self._background is None:
+            self.draw()
+            return
+        self.restore_region(self._background)
+        self._draw_animated()
+        self.blit(self.fig.bbox)
+
+    def paintEvent(self, event):
+        super(MatplotlibCanvas, self).paintEvent(event)
+        # Sadece plot()'u izleyen boyama sayılır; kaplama etiketi veya expose kaynaklı olanlar değil
+        if self._paint_pending:
+            self._paint_pending = False
+            self.painted.emit()
 class ZoomCanvas(FigureCanvas):
+    """
+    Kazık ucu etrafındaki yakın görünüm. Arka planda eksen işareti/grid
+    olmadığı için görünüm her karede kaysa da arka plan sabittir: hedef,
+    tolerans ve kazık ucu daireleri kalıcıdır, sadece konumları güncellenip
+    blit ile çizilir. Kare süresi frame_time_ms ile ölçülür.
+    """
+    painted = pyqtSignal()
     def __init__(self, parent=None):
         # 1 metre x 1 metre kare figür oluştur
         self.fig, self.ax = plt.subplots(figsize=(5, 5))
         super(ZoomCanvas, self).__init__(self.fig)
         self.fig.patch.set_alpha(0)  # Figür arkaplanı
-
-    def plot(self, gdf, vehicle_position, heading, zoomScale, completedJobs):
-        """Zoomed 1 metre görünümde, GeoDataFrame noktalarını ve aracı sarı nokta olarak çiz."""
-        self.ax.clear()  # Önceki çizimi temizle
-        target_point = None
-        stake_color = 'red'
-        _, stake_coords = get_scaled_vehicle_coords(vehicle_position.x, vehicle_position.y, heading)
-        stake_x, stake_y = stake_coords[0]
-        # Mevcut hedef noktayı bul
-        for i in range(len(completedJobs)):
-            if completedJobs[i] == 0:
-                target_point = gdf.geometry[i]
-                break
-        if target_point is not None:
-            # Hedef noktayı sarı yuvarlak olarak çiz
-            self.ax.add_patch(plt.Circle((target_point.x, target_point.y), facecolor='yellow', radius=0.05 / 111320, edgecolor='black', linewidth=1))
-
-            # Tolerans kadar gri yuvarlak çiz
-            self.ax.add_patch(plt.Circle((target_point.x, target_point.y), facecolor='#a9a9a9', radius=TOLERANCE, edgecolor='black', linewidth=1, alpha=0.5))
-
-            # Kazık çakma noktasını çiz
-
-            stake_reached = False
-            for i, point in enumerate(gdf.geometry):
-                if abs(stake_x - target_point.x) < TOLERANCE and abs(stake_y - target_point.y) < TOLERANCE:
-                    stake_color = 'green'
-                    stake_reached = True
-                    break
-                else:
-                    stake_color = 'red'
-        self.ax.add_patch(plt.Circle((stake_x, stake_y), facecolor=stake_color, radius=0.05*zoomScale / 111320, edgecolor='black', linewidth=1))
-
-        # 1 metre alanı zoom yap
-        zoom_factor = zoomScale / 111320  # Yaklaşık 1 metre
-        self.ax.set_xlim(stake_x - zoom_factor, stake_x + zoom_factor)
-        self.ax.set_ylim(stake_y - zoom_factor, stake_y + zoom_factor)
+        self.last_frame_ms = 0.0  # Son karenin süresi
+        self.frame_time_ms = 0.0  # Kare süresinin üstel ortalaması
+        self._paint_pending = False  # plot() sonrası boyama bekleniyor (gecikme ölçümü)
+        self._background = None
+        self._setup_axes()
+        self.mpl_connect('draw_event', self._on_draw)
+
+    def _setup_axes(self):
+        """Eksen stilini ve kalıcı daireleri bir kez oluştur."""
         self.ax.set_aspect('equal', 'box')  # Kare oranı koru
         self.ax.set_xticks([])
         self.ax.set_yticks([])
@@ -524,9 +874,78 @@ class ZoomCanvas(FigureCanvas):
             spine.set_edgecolor("#167D7F")
         self.ax.patch.set_alpha(0)   # Eksen arkaplanı
         self.ax.patch.set_color("#BBBBBB")
-        
+
+        # Hedef nokta (sarı), tolerans alanı (gri) ve kazık ucu
+        self.target_circle = plt.Circle((0, 0), facecolor='yellow', radius=0.05, edgecolor='black', linewidth=1, animated=True, visible=False)
+        self.tolerance_circle = plt.Circle((0, 0), facecolor='#a9a9a9', radius=TOLERANCE, edgecolor='black', linewidth=1, alpha=0.5, animated=True, visible=False)
+        self.stake_circle = plt.Circle((0, 0), facecolor='red', radius=0.05, edgecolor='black', linewidth=1, animated=True)
+        for artist in (self.target_circle, self.tolerance_circle, self.stake_circle):
+            self.ax.add_patch(artist)
+
+    def clear_plan(self):
+        """Projeyi kapatırken hedef dairelerini gizle."""
+        self.target_circle.set_visible(False)
+        self.tolerance_circle.set_visible(False)
         self.draw()
 
+    def plot(self, gdf, vehicle_position, heading, zoomScale, jobs, display_pose=None):
+        """Zoomed 1 metre görünümde hedef noktayı, toleransı ve kazık ucunu güncelle (renk gerçek konumdan)."""
+        t0 = time.perf_counter()
+        self._paint_pending = True
+        target_point = None
+        stake_color = 'red'
+        _, stake_coords = get_scaled_vehicle_coords(vehicle_position.x, vehicle_position.y, heading)
+        stake_x, stake_y = stake_coords[0]
+        # Mevcut hedef nokta
+        if gdf is not None and jobs.current is not None:
+            target_point = gdf.geometry[jobs.current]
+        if target_point is not None:
+            self.target_circle.set_center((target_point.x, target_point.y))
+            self.tolerance_circle.set_center((target_point.x, target_point.y))
+            if math.hypot(stake_x - target_point.x, stake_y - target_point.y) <= TOLERANCE:
+                stake_color = 'green'
+        if display_pose is not None:
+            _, stake_coords = get_scaled_vehicle_coords(*display_pose)
+            stake_x, stake_y = stake_coords[0]
+        self.target_circle.set_visible(target_point is not None)
+        self.tolerance_circle.set_visible(target_point is not None)
+        self.stake_circle.set_center((stake_x, stake_y))
+        self.stake_circle.set_radius(0.05 * zoomScale)
+        self.stake_circle.set_facecolor(stake_color)
+
+        # 1 metre alanı zoom yap
+        zoom_factor = zoomScale  # metre
+        self.ax.set_xlim(stake_x - zoom_factor, stake_x + zoom_factor)
+        self.ax.set_ylim(stake_y - zoom_factor, stake_y + zoom_factor)
+        self._blit()
+
+        self.last_frame_ms = (time.perf_counter() - t0) * 1000
+        self.frame_time_ms += 0.1 * (self.last_frame_ms - self.frame_time_ms)
+
+    def _on_draw(self, event):
+        """Tam çizimden sonra boş ekseni sakla ve daireleri üstüne çiz."""
+        self._background = self.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        self.ax.draw_artist(self.target_circle)
+        self.ax.draw_artist(self.tolerance_circle)
+        self.ax.draw_artist(self.stake_circle)
+
+    def _blit(self):
+        if self._background is None:
+            self.draw()
+            return
+        self.restore_region(self._background)
+        self._draw_animated()
+        self.blit(self.fig.bbox)
+
+    def paintEvent(self, event):
+        super(ZoomCanvas, self).paintEvent(event)
+        if self._paint_pending:
+            self._paint_pending = False
+            self.painted.emit()
+
     def rotate_point(self, x, y, cx, cy, angle):
         """Bir noktayı belirli bir açıyla döndür."""
         s = np.sin(angle)
@@ -545,164 +964,144 @@ class ZoomCanvas(FigureCanvas):
         y_new += cy
 
         return x_new, y_new
-class RowManager:
-    def __init__(self, scroll_area, wdScrollArea):
-        """
-        RowManager sınıfı, QScrollArea içinde QWidget'lar ekleme ve güncelleme işlemleri için tasarlanmıştır.
-        :param scroll_area: Satırların ekleneceği QScrollArea
-        """
-        self.scroll_area = scroll_area
-        self.container_widget = wdScrollArea  # QScrollArea'nın içindeki container
-        self.container_layout = QVBoxLayout(self.container_widget)
-        self.container_layout.setSpacing(5)  # Satırlar arası boşluk
-        self.container_layout.setAlignment(Qt.AlignTop)
-        self.scroll_area.setWidget(self.container_widget)
-        self.scroll_area.setWidgetResizable(True)
-        
-        self.rows = []  # Tüm satırların referanslarını tutan liste
-
-    def add(self, order, x, y, z):
-        """
-        Yeni bir satır ekler.
-        :param order: lblOrder değeri
-        :param x: lblX değeri
-        :param y: lblY değeri
-        :param z: lblZ değeri
-        """
-        # Satır için QWidget oluştur
-        row_widget = QWidget()
-        row_widget.setFixedSize(400, 20)
-        row_layout = QHBoxLayout(row_widget)
-        row_layout.setContentsMargins(0, 0, 0, 0)
-
-        # QLabel'ları oluştur ve ekle
-        lbl_order = QLabel(str(order))
-        
-        lbl_order.setFixedWidth(40)
-        lbl_x = QLabel(str(x))
-        lbl_x.setFixedWidth(120)
-        lbl_y = QLabel(str(y))
-        lbl_y.setFixedWidth(120)
-        lbl_z = QLabel(str(z))
-        lbl_z.setFixedWidth(120)
-        lbl_order.setStyleSheet("font: 12pt;")
-        lbl_x.setStyleSheet("font: 12pt;")
-        lbl_y.setStyleSheet("font: 12pt;")
-        lbl_z.setStyleSheet("font: 12pt;")
-
-        # QLabel'ları layout'a ekle
-        row_layout.addWidget(lbl_order)
-        row_layout.addWidget(lbl_x)
-        row_layout.addWidget(lbl_y)
-        row_layout.addWidget(lbl_z)
-
-        # Satırı container'a ekle
-        self.container_layout.addWidget(row_widget)
-
-        # Satırı ve QLabel referanslarını kaydet
-        self.rows.append({
-            "widget": row_widget,
-            "labels": [lbl_order, lbl_x, lbl_y, lbl_z]
-        })
-
-    def update(self, index, color=None):
-        """
-        Mevcut bir satırı günceller.
-        :param index: Güncellenecek satırın sırası (0 tabanlı)
-        :param color: QLabel'ların yeni arka plan rengi (QColor objesi veya hex string)
-        :param border_color: Satırın border rengini ayarlar (QColor objesi veya hex string)
-        """
-        if index < 0 or index >= len(self.rows):
-            raise IndexError("Invalid row index.")
-
-        row = self.rows[index]
-        row_widget = row["widget"]
-        labels = row["labels"]
-
-
-        # QLabel'ların arka plan rengini değiştir
-        if color == 'y':
-            for label in labels: label.setStyleSheet("font: 12pt; color: rgb(229, 195, 91);")
-        if color == 'r':
-            for label in labels: label.setStyleSheet("font: 12pt; color: rgb(255, 0, 0);")
-        if color == 'g':
-            for label in labels: label.setStyleSheet("font: 12pt; color: rgb(0, 255, 0);")
-        # Satırın border rengini değiştir
-
-class GNSS_Threading(QThread):
-    # res = None
-    # res_lock = threading.Lock()
-    sgGNSS = pyqtSignal(str)
-    # host = "192.168.1.203"
-    # port = 9904
-    def __init__(self, host, port):
-        super().__init__()
+class GnssDevice(QObject):
+    """
+    GPCHC alıcısı; DeviceLoop üzerinde asyncio görevi olarak çalışır.
+
+    Soket verisi doğrudan çerçeveleyicinin tamponuna alınır, cümleler
+    döngü iş parçacığında ayrıştırılıp posta kutusuna bırakılır. Bağlantı
+    koparsa veya GNSS_RECV_TIMEOUT boyunca veri gelmezse yeniden bağlanır;
+    stop() görevi iptal eder (bloklayan recv yok).
+    """
+    # Posta kutusu boşken yeni konum gelince bir kez yayınlanır; GUI yavaşsa
+    # kuyrukta en fazla bir bildirim bekler, aradaki konumlar atılır
+    sgFixReady = pyqtSignal()
+    sgStatus = pyqtSignal(str)  # Bağlantı durumu (durum çubuğu)
+
+    def __init__(self, devices, host, port, frame=None, parent=None):
+        super(GnssDevice, self).__init__(parent)
+        self.devices = devices
         self.host = host
         self.port = port
-        self.s = None
+        self.frame = frame  # Konumlar bu yerel çerçeveye izdüşürülür
+        self.mailbox = LatestMailbox()
+        self.fn = externalFunctions()
+        self.link = TcpLink()
+        self.n_parse_errors = 0
+        self._task = None
+
+    def start(self):
+        self._task = self.devices.spawn(tcp_stream(self.host, self.port, GpchcFramer, self._on_sentences, self.link,
+                                                   GNSS_RECV_TIMEOUT, GNSS_RECONNECT_DELAY, self.sgStatus.emit))
+
+    def stop(self):
+        if self._task is not None:
+            self.devices.loop.call_soon_threadsafe(self._task.cancel)
+            self._task = None
+
+    def _on_sentences(self, sentences, t_recv, t_frame):
+        for sentence in sentences:
+            try:
+                sample = make_gnss_sample(sentence, self.fn, self.frame, new_stamps(t_recv, t_frame))
+            except ValueError:
+                self.n_parse_errors += 1
+                continue
+            if self.mailbox.put(sample):
+                self.sgFixReady.emit()
+
+
+class GNSS_Replay(QThread):
+    """
+    Kaydedilmiş GPCHC loglarını alıcı yerine oynatır.
+
+    GnssDevice ile aynı arayüz (sgFixReady, mailbox): cümleler aynı
+    çerçeveleyici ve make_gnss_sample yolundan geçer, GUI farkı görmez.
+    Zamanlama log'daki GPSTime'a (veya log zaman damgasına) göre yapılır;
+    speed=1 gerçek zaman, speed=N N kat hızlı, speed=0 beklemesiz.
+    seek() ve set_speed() oynatma sürerken başka iş parçacığından çağrılabilir.
+    """
+    sgFixReady = pyqtSignal()
+    MAX_SLEEP = 0.05  # seek/stop'a bu süre içinde cevap ver (s)
+
+    def __init__(self, source, speed=1.0, time_base='gps', frame=None, loop=False):
+        super().__init__()
+        self.sentences, self.offsets = load_replay(source, time_base)
+        self.frame = frame
+        self.loop = loop
+        self.framer = GpchcFramer()
+        self.mailbox = LatestMailbox()
+        self.fn = externalFunctions()
+        self.n_parse_errors = 0
+        self.n_sent = 0
+        self.max_late = 0.0  # Planlanan zamandan en büyük gecikme (s)
+        self.position = 0.0  # Son gönderilen cümlenin log'daki zamanı (s)
+        self.running = False
+        self._speed = speed
+        self._seek_to = None
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self):
+        return float(self.offsets[-1]) if len(self.offsets) else 0.0
+
+    def set_speed(self, speed):
+        with self._lock:
+            self._speed = speed
+            self._seek_to = self.position if self._seek_to is None else self._seek_to
+
+    def seek(self, seconds):
+        """Oynatmayı log'un başından itibaren verilen saniyeye atla."""
+        with self._lock:
+            self._seek_to = min(max(seconds, 0.0), self.duration)
+
+    def stop(self):
+        self.running = False
 
     def run(self):
-        self.s = self.connect(self.host, self.port)
-        while True:
-            self.recieve(self.s)
-
-    def connect(self, host, port):
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        try:
-            s.connect((host, port))
-        except Exception as e:
-            print(e)
-
-        return s
-
-    def recieve(self, s):
-        data = s.recv(1024)
-        res = data.decode()
-        self.sgGNSS.emit(res)
-        time.sleep(0.05)
+        self.running = True
+        n = len(self.sentences)
+        i = 0
+        speed = self._speed
+        anchor_wall, anchor_offset = time.perf_counter(), 0.0
+        while self.running and i < n:
+            with self._lock:
+                if self._seek_to is not None:
+                    i = int(np.searchsorted(self.offsets, self._seek_to))
+                    anchor_wall, anchor_offset = time.perf_counter(), self._seek_to
+                    speed, self._seek_to = self._speed, None
+                    self.framer = GpchcFramer()  # Yarım kalmış cümleyi at
+                    if i >= n:
+                        break
+            if speed > 0:
+                delay = anchor_wall + (self.offsets[i] - anchor_offset) / speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(min(delay, self.MAX_SLEEP))
+                    continue
+                self.max_late = max(self.max_late, -delay)
+            self.send(self.sentences[i])
+            self.position = float(self.offsets[i])
+            i += 1
+            if i == n and self.loop:
+                i = 0
+                anchor_wall, anchor_offset = time.perf_counter(), 0.0
+        self.running = False
+
+    def send(self, sentence):
+        t_recv = time.perf_counter()
+        sentences = self.framer.feed(sentence + b'\r\n')
+        t_frame = time.perf_counter()
+        for sentence in sentences:
+            try:
+                sample = make_gnss_sample(sentence, self.fn, self.frame, new_stamps(t_recv, t_frame))
+            except ValueError:
+                self.n_parse_errors += 1
+                continue
+            self.n_sent += 1
+            if self.mailbox.put(sample):
+                self.sgFixReady.emit()
+
+
 class externalFunctions:    
-    def parse_gpchc_message(self,message):
-        """
-        Parses a $GPCHC message into a dictionary.
-        Extracts the Status and Warning fields into separate dictionaries.
-        
-        Args:
-            message (str): The GPCHC message as a string.
-        
-        Returns:
-            dict: Parsed message data, including nested dictionaries for Status and Warning.
-        """
-        fields = [
-            "Header", "GPSWeek", "GPSTime", "Heading", "Pitch", "Roll", "gyro x", "gyro y", "gyro z",
-            "acc x", "acc y", "acc z", "Latitude", "Longitude", "Altitude", "Ve", "Vn", "Vu", "V",
-            "NSV1", "NSV2", "Status", "Age", "Warning", "Cs"
-        ]
-        
-        # Remove $ and <CR><LF> from the message, split by ',' or '*'
-        message_cleaned = message.strip().decode('utf-8').replace('$', '').split('*')
-        data = message_cleaned[0].split(',') + [message_cleaned[1]]
-        
-        parsed_data = {}
-        status_dict = {}
-        warning_dict = {}
-        
-        for i, field in enumerate(fields):
-            if field == "Status":
-                status_value = int(data[i])
-                status_dict["System State"] = status_value & 0xF  # Lower 4 bits
-                status_dict["Satellite State"] = (status_value >> 4) & 0xF  # Upper 4 bits
-                parsed_data[field] = status_dict
-            elif field == "Warning":
-                warning_value = int(data[i])
-                warning_dict["No GPS message"] = (warning_value & 0b0001) != 0
-                warning_dict["No velocity message"] = (warning_value & 0b0010) != 0
-                warning_dict["gyro wrong"] = (warning_value & 0b0100) != 0
-                warning_dict["acc wrong"] = (warning_value & 0b1000) != 0
-                parsed_data[field] = warning_dict
-            else:
-                parsed_data[field] = data[i]
-        
-        return parsed_data
     def interpret_status(self,status_dict):
         """
         Interprets the Status field from the parsed GPCHC message.
@@ -750,61 +1149,81 @@ class externalFunctions:
             "Satellite State Description": satellite_description
         }
 
-class SerialThread(QThread):
+class SensorDevice(QObject):
+    """
+    Modbus RTU mesafe sensörü; DeviceLoop üzerinde asyncio görevi olarak yoklanır.
+
+    Her örnek (time.monotonic, mm; aralık dışıysa NaN) samples halkasına
+    yazılır. Etikete sadece metin değişince sinyal gönderilir. Sensörün
+    başka değerleri de gerekiyorsa register_count artırılır; hepsi tek
+    istekte okunur, ilki mesafedir, tamamı registers'ta durur.
+    """
     sensor_data_received = pyqtSignal(str)
 
-    def __init__(self, port='COM6', baudrate=9600, timeout=1):
-        super().__init__()
+    def __init__(self, devices, port='COM6', baudrate=9600, poll_rate=SENSOR_POLL_HZ, register_count=1, parent=None):
+        super(SensorDevice, self).__init__(parent)
+        self.devices = devices
         self.port = port
         self.baudrate = baudrate
-        self.timeout = timeout
-        self.command = bytes.fromhex('01 04 00 00 00 01 31 CA')
+        self.slave = 1
+        self.register = 0
+        self.register_count = register_count
+        self.poll_rate = min(poll_rate, max_poll_rate(baudrate, response_len=read_registers_response_len(register_count)))
+        self.registers = None  # Son okunan register değerleri
         self.min_val = 4000
         self.max_val = 20000
         self.min_dist = 297  # mm
         self.max_dist = 832  # mm
-        self.running = True
+        self.reconnect_delay = 1.0
+        self.samples = SampleRing()
+        self.client = None
+        self._last_text = None
+        self._task = None
 
-    def run(self):
-        try:
-            ser = serial.Serial(self.port, self.baudrate, timeout=self.timeout)
-            print(f"Bağlantı kuruldu: {ser.name}")
-
-            while self.running:
-                response = self.send_command_and_read_response(ser, self.command)
-                if response:
-                    value = self.parse_response(response)
-                    if value is not None:
-                        scaled_value = self.scale_value(value, self.min_val, self.max_val, self.min_dist, self.max_dist)
-                        self.sensor_data_received.emit(f"{scaled_value} mm")
-                    else:
-                        self.sensor_data_received.emit("Out of range")
-                time.sleep(1)  # Her saniyede bir komut gönder ve yanıtı oku
-
-        except serial.SerialException as e:
-            print(f"Seri port hatası: {e}")
-        except KeyboardInterrupt:
-            print("Bağlantı sonlandırıldı.")
-        finally:
-            if ser.is_open:
-                ser.close()
-                print("Seri port kapatıldı.")
+    def start(self):
+        self._task = self.devices.spawn(self.run())
 
-    def send_command_and_read_response(self, ser, command, response_length=7):
-        try:
-            ser.write(command)
-            time.sleep(0.1)  # Küçük bir gecikme ekleyin
-            response = ser.read(response_length)
-            return response
-        except serial.SerialException as e:
-            print(f"Seri port hatası: {e}")
-            return None
+    def stop(self):
+        if self._task is not None:
+            self.devices.loop.call_soon_threadsafe(self._task.cancel)
+            self._task = None
 
-    def parse_response(self, response):
-        if len(response) >= 5:
-            value = response[3] << 8 | response[4]
-            return value
-        return None
+    async def run(self):
+        # Port açılamazsa veya koparsa yeniden dene; iptal her await'te hemen işler
+        while True:
+            try:
+                port = AsyncSerial(serial.Serial(self.port, self.baudrate, timeout=0))
+            except serial.SerialException as e:
+                print(f"Seri port hatası: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+            print(f"Bağlantı kuruldu: {port.ser.name}")
+            self.client = ModbusRtuClient(port, self.baudrate)
+            try:
+                await poll(self.poll_rate,
+                           lambda: self.client.read_input_registers(self.slave, self.register, self.register_count),
+                           self.on_sample)
+            except (serial.SerialException, OSError) as e:
+                print(f"Seri port hatası: {e}")
+            finally:
+                port.close()
+                print("Seri port kapatıldı.")
+            await asyncio.sleep(self.reconnect_delay)
+
+    def on_sample(self, t, result):
+        if isinstance(result, ModbusError):
+            return  # Sayaçlar client'ta; etiket son geçerli değeri gösterir
+        self.registers = result
+        scaled_value = self.scale_value(int(result[0]), self.min_val, self.max_val, self.min_dist, self.max_dist)
+        if scaled_value == "Out of range":
+            self.samples.append(t, np.nan)
+            text = "Out of range"
+        else:
+            self.samples.append(t, scaled_value)
+            text = f"{scaled_value:.1f} mm"
+        if text != self._last_text:
+            self._last_text = text
+            self.sensor_data_received.emit(text)
 
     def scale_value(self, value, min_val, max_val, min_dist, max_dist):
         if value < min_val:
@@ -815,13 +1234,30 @@ class SerialThread(QThread):
             scaled_value = min_dist + (value - min_val) * (max_dist - min_dist) / (max_val - min_val)
             return scaled_value
 
-    def stop(self):
-        self.running = False
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    # python main.py [--gnss HOST:PORT] [--replay LOG ...] [--speed N] [--time-base gps|log]
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--gnss', metavar='HOST:PORT', help=f"GPCHC alıcısı (varsayılan {GNSS_HOST}:{GNSS_PORT})")
+    parser.add_argument('--replay', nargs='+', metavar='LOG', help="Alıcı yerine GPCHC loglarını oynat")
+    parser.add_argument('--speed', type=float, default=REPLAY_SPEED, help="Oynatma hızı (0: en yüksek)")
+    parser.add_argument('--latency-report', metavar='PATH', help="Çıkışta gecikme raporunu bu dosyaya yaz")
+    parser.add_argument('--time-base', choices=('gps', 'log'), default=REPLAY_TIME_BASE)
+    args, qt_args = parser.parse_known_args()
+    if args.gnss:
+        host, _, port = args.gnss.rpartition(':')
+        GNSS_HOST, GNSS_PORT = host or GNSS_HOST, int(port)
+        flDebugMode = False  # Adres verildiyse alıcıya (veya emülatöre) bağlan
+    if args.replay:
+        REPLAY_LOGS = args.replay if len(args.replay) > 1 else args.replay[0]
+        REPLAY_SPEED, REPLAY_TIME_BASE = args.speed, args.time_base
+    app = QApplication(sys.argv[:1] + qt_args)
     window = MainApp()
     window.show()
 
-    sys.exit(app.exec_())
+    status = app.exec_()
+    if args.latency_report:
+        window.dump_latency_report(args.latency_report)
+    sys.exit(status)
 
@@ -0,0 +1,323 @@
+import math
+import sys
+import time
+
+import numpy as np
+from PyQt5.QtCore import Qt, QPointF, QRectF, QTimer, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor, QPainter, QPen, QPixmap, QPolygonF
+from PyQt5.QtWidgets import QWidget
+
+from jobState import JobState
+from navigation import (GridIndex, get_scaled_vehicle_coords, TOLERANCE, MAIN_VIEW_HALF_SIZE, INDEX_CELL_SIZE,
+                        PILE_COLOR_CURRENT, PILE_COLOR_DONE, PILE_COLOR_OTHER)
+
+BORDER_COLOR = "#167D7F"
+GRID_COLOR = "#98D7C2"
+GRID_STEP = 10  # m
+
+
+class MapView(QWidget):
+    """
+    MatplotlibCanvas yerine kullanılabilen QPainter tabanlı ana harita.
+
+    Görünür kazıklar ve grid, görünümden recenter_distance kadar büyük bir
+    QPixmap'e bir kez çizilir. Her karede sadece bu pixmap kaydırılarak
+    basılır, üstüne araç ve kazık ucu çizilir. Pixmap, araç pixmap
+    merkezinden recenter_distance kadar uzaklaşınca ya da iş durumu
+    değişince yeniden oluşturulur.
+    """
+    stake_position_reached = pyqtSignal(bool)
+    painted = pyqtSignal()  # Kare ekrana basıldı (gecikme ölçümü)
+
+    def __init__(self, parent=None):
+        super(MapView, self).__init__(parent)
+        self.heading = 0  # Başlangıç yönü (radyan cinsinden)
+        self.recenter_distance = 10
+        self.last_frame_ms = 0.0
+        self.frame_time_ms = 0.0
+        self._paint_pending = False  # plot() sonrası boyama bekleniyor (gecikme ölçümü)
+
+        self._index = None
+        self._status = np.empty(0, dtype=np.int8)  # 0: diğer, 1: tamamlandı, 2: mevcut hedef
+        self._edges = np.empty(0, dtype=np.int64)  # Kazığın kenar kalemi (tip rengi) numarası
+        self._pens = [QPen(Qt.black, 1)]
+        self._jobs = None
+        self._jobs_seq = 0
+        self._current_index = None
+        self._center = None  # Görünüm merkezi (araç konumu)
+        self._vehicle = []
+        self._stake = (0.0, 0.0)
+        self._stake_reached = False
+        self._pixmap = None
+        self._pixmap_center = None
+        self._pixmap_dirty = True
+        self._brushes = [QBrush(QColor(PILE_COLOR_OTHER)), QBrush(QColor(PILE_COLOR_DONE)), QBrush(QColor(PILE_COLOR_CURRENT))]
+
+    def clear_plan(self):
+        """Projeyi kapatırken kazıkları kaldır."""
+        self._index = None
+        self._status = np.empty(0, dtype=np.int8)
+        self._edges = np.empty(0, dtype=np.int64)
+        self._jobs = None
+        self._pixmap_dirty = True
+        self.update()
+
+    def plot(self, gdf, vehicle_position, zoomScale, jobs, spatial_index=None, display_pose=None):
+        """MatplotlibCanvas.plot ile aynı arayüz: durumu güncelle ve yeniden boyama iste."""
+        self._paint_pending = True
+        current_index = jobs.cursor
+
+        if gdf is None:
+            spatial_index = None
+        if spatial_index is not self._index or jobs is not self._jobs:
+            self._index = spatial_index
+            self._jobs = jobs
+            self._jobs_seq = jobs.seq
+            self._current_index = current_index
+            self._status = jobs.color_codes() if spatial_index is not None else np.empty(0, dtype=np.int8)
+            self._set_edge_colors(gdf if spatial_index is not None else None)
+            self._pixmap_dirty = True
+        elif self._index is not None and (jobs.seq != self._jobs_seq or current_index != self._current_index):
+            changed, self._jobs_seq = jobs.changes_since(self._jobs_seq)
+            changed = np.append(changed, [self._current_index, current_index])
+            changed = changed[changed < len(self._status)]
+            self._status[changed] = jobs.color_codes(changed)
+            self._current_index = current_index
+            self._pixmap_dirty = True
+
+        self._vehicle, stake_coords = get_scaled_vehicle_coords(vehicle_position.x, vehicle_position.y, self.heading)
+        self._stake = stake_x, stake_y = stake_coords[0]
+        stake_reached = False
+        if self._index is not None:
+            in_tolerance = self._index.query_radius(stake_x, stake_y, TOLERANCE)
+            stake_reached = current_index in in_tolerance
+        self._stake_reached = stake_reached
+        self.stake_position_reached.emit(stake_reached)
+
+        self._center = (vehicle_position.x, vehicle_position.y)
+        if display_pose is not None:
+            # Tahmini pozda çiz; tolerans kararı yukarıda gerçek konumla verildi
+            self._vehicle, stake_coords = get_scaled_vehicle_coords(*display_pose)
+            self._stake = stake_coords[0]
+            self._center = display_pose[:2]
+        if (self._pixmap_center is None
+                or abs(self._center[0] - self._pixmap_center[0]) > self.recenter_distance
+                or abs(self._center[1] - self._pixmap_center[1]) > self.recenter_distance):
+            self._pixmap_dirty = True
+        self.update()
+
+    def _set_edge_colors(self, gdf):
+        """Kenar rengi .c3d'deki kazık tipinden (color sütunu), dolgu iş durumundan."""
+        if gdf is None or 'color' not in gdf:
+            self._edges = np.zeros(len(self._status), dtype=np.int64)
+            self._pens = [QPen(Qt.black, 1)]
+            return
+        names, self._edges = np.unique(gdf['color'].to_numpy(dtype=str), return_inverse=True)
+        self._pens = [QPen(QColor(name), 1) for name in names]
+
+    def resizeEvent(self, event):
+        # Katman eski ölçek ve boyutla çizildi
+        self._pixmap_dirty = True
+        super(MapView, self).resizeEvent(event)
+
+    def _scale(self):
+        """Metre başına piksel."""
+        return min(self.width(), self.height()) / (2 * MAIN_VIEW_HALF_SIZE)
+
+    def _render_layer(self, scale):
+        """Kazık ve grid katmanını pixmap'e çiz (araç konumundan bağımsız)."""
+        margin = self.recenter_distance * scale
+        w, h = int(self.width() + 2 * margin) + 2, int(self.height() + 2 * margin) + 2
+        self._pixmap_center = cx, cy = self._center
+        half_x, half_y = w / 2 / scale, h / 2 / scale
+        self._pixmap = QPixmap(w, h)
+        self._pixmap.fill(Qt.transparent)
+
+        painter = QPainter(self._pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        # Grid: dünya koordinatında 10 m'de bir
+        pen = QPen(QColor(GRID_COLOR), 1, Qt.DashLine)
+        painter.setPen(pen)
+        for gx in np.arange(np.ceil((cx - half_x) / GRID_STEP), np.floor((cx + half_x) / GRID_STEP) + 1) * GRID_STEP:
+            px = w / 2 + (gx - cx) * scale
+            painter.drawLine(QPointF(px, 0), QPointF(px, h))
+        for gy in np.arange(np.ceil((cy - half_y) / GRID_STEP), np.floor((cy + half_y) / GRID_STEP) + 1) * GRID_STEP:
+            py = h / 2 - (gy - cy) * scale
+            painter.drawLine(QPointF(0, py), QPointF(w, py))
+
+        if self._index is not None:
+            pad = 1
+            visible = self._index.query_box(cx - half_x - pad, cy - half_y - pad, cx + half_x + pad, cy + half_y + pad)
+            xs = w / 2 + (self._index.x[visible] - cx) * scale
+            ys = h / 2 - (self._index.y[visible] - cy) * scale
+            radius = scale  # 1 m
+            status = self._status[visible]
+            edges = self._edges[visible]
+            for edge, pen in enumerate(self._pens):
+                painter.setPen(pen)
+                for code, brush in enumerate(self._brushes):
+                    painter.setBrush(brush)
+                    selected = (status == code) & (edges == edge)
+                    for px, py in zip(xs[selected], ys[selected]):
+                        painter.drawEllipse(QPointF(px, py), radius, radius)
+        painter.end()
+        self._pixmap_dirty = False
+
+    def paintEvent(self, event):
+        if self._center is None:
+            return
+        t0 = time.perf_counter()
+        scale = self._scale()
+        if self._pixmap_dirty or self._pixmap is None:
+            self._render_layer(scale)
+
+        cx, cy = self._center
+        w, h = self.width(), self.height()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        # Pixmap merkezinin ekrandaki yeri
+        px = w / 2 + (self._pixmap_center[0] - cx) * scale - self._pixmap.width() / 2
+        py = h / 2 - (self._pixmap_center[1] - cy) * scale - self._pixmap.height() / 2
+        painter.drawPixmap(QPointF(px, py), self._pixmap)
+
+        def to_px(x, y):
+            return QPointF(w / 2 + (x - cx) * scale, h / 2 - (y - cy) * scale)
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QBrush(Qt.black))
+        painter.drawPolygon(QPolygonF([to_px(x, y) for x, y in self._vehicle]))
+
+        painter.setPen(QPen(Qt.black, 1))
+        painter.setBrush(QBrush(QColor('green' if self._stake_reached else 'red')))
+        r = 0.5 * scale
+        painter.drawEllipse(to_px(*self._stake), r, r)
+
+        painter.setPen(QPen(QColor(BORDER_COLOR), 2))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(QRectF(1, 1, w - 2, h - 2))
+        painter.end()
+
+        self.last_frame_ms = (time.perf_counter() - t0) * 1000
+        self.frame_time_ms += 0.1 * (self.last_frame_ms - self.frame_time_ms)
+        if self._paint_pending:
+            self._paint_pending = False
+            self.painted.emit()
+
+
+class ZoomView(QWidget):
+    """ZoomCanvas yerine kullanılabilen QPainter tabanlı yakın görünüm."""
+    painted = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super(ZoomView, self).__init__(parent)
+        self.last_frame_ms = 0.0
+        self.frame_time_ms = 0.0
+        self._paint_pending = False  # plot() sonrası boyama bekleniyor (gecikme ölçümü)
+        self._stake = None
+        self._target = None
+        self._stake_color = 'red'
+        self._zoom_scale = 5.0
+
+    def clear_plan(self):
+        """Projeyi kapatırken hedefi gizle."""
+        self._target = None
+        self.update()
+
+    def plot(self, gdf, vehicle_position, heading, zoomScale, jobs, display_pose=None):
+        """ZoomCanvas.plot ile aynı arayüz."""
+        self._paint_pending = True
+        target = None
+        if gdf is not None and jobs.current is not None:
+            point = gdf.geometry[jobs.current]
+            target = (point.x, point.y)
+        _, stake_coords = get_scaled_vehicle_coords(vehicle_position.x, vehicle_position.y, heading)
+        self._stake = stake_coords[0]
+        self._target = target
+        self._zoom_scale = zoomScale
+        self._stake_color = 'red'
+        if target is not None and math.hypot(self._stake[0] - target[0], self._stake[1] - target[1]) <= TOLERANCE:
+            self._stake_color = 'green'
+        if display_pose is not None:
+            _, stake_coords = get_scaled_vehicle_coords(*display_pose)
+            self._stake = stake_coords[0]
+        self.update()
+
+    def paintEvent(self, event):
+        if self._stake is None:
+            return
+        t0 = time.perf_counter()
+        side = min(self.width(), self.height())
+        scale = side / (2 * self._zoom_scale)
+        sx, sy = self._stake
+        w, h = self.width(), self.height()
+
+        def to_px(x, y):
+            return QPointF(w / 2 + (x - sx) * scale, h / 2 - (y - sy) * scale)
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setClipRect(QRectF((w - side) / 2, (h - side) / 2, side, side))
+        painter.setPen(QPen(Qt.black, 1))
+        if self._target is not None:
+            center = to_px(*self._target)
+            painter.setBrush(QBrush(QColor('yellow')))
+            r = 0.05 * scale
+            painter.drawEllipse(center, r, r)
+            tolerance = QColor('#a9a9a9')
+            tolerance.setAlphaF(0.5)
+            painter.setBrush(QBrush(tolerance))
+            r = TOLERANCE * scale
+            painter.drawEllipse(center, r, r)
+        painter.setBrush(QBrush(QColor(self._stake_color)))
+        r = 0.05 * self._zoom_scale * scale
+        painter.drawEllipse(to_px(sx, sy), r, r)
+
+        painter.setClipping(False)
+        painter.setPen(QPen(QColor(BORDER_COLOR), 2))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(QRectF((w - side) / 2 + 1, (h - side) / 2 + 1, side - 2, side - 2))
+        painter.end()
+
+        self.last_frame_ms = (time.perf_counter() - t0) * 1000
+        self.frame_time_ms += 0.1 * (self.last_frame_ms - self.frame_time_ms)
+        if self._paint_pending:
+            self._paint_pending = False
+            self.painted.emit()
+
+
+if __name__ == "__main__":
+    # python mapView.py [kazık sayısı]: sentetik planda 60 Hz araç hareketi ile kare süresini ölç
+    from types import SimpleNamespace
+    import geopandas as gpd
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    side = int(np.ceil(np.sqrt(n)))
+    gx, gy = np.meshgrid(np.arange(side), np.arange(side))
+    x0, y0 = 0.0, 0.0  # Yerel çerçeve, metre
+    xs, ys = (x0 + gx.ravel() * 3.0)[:n], (y0 + gy.ravel() * 3.0)[:n]
+    gdf = gpd.GeoDataFrame(geometry=gpd.points_from_xy(xs, ys))
+    index = GridIndex(xs, ys, INDEX_CELL_SIZE)
+    jobs = JobState(n)
+    view = MapView()
+    view.resize(800, 800)
+    view.show()
+
+    state = SimpleNamespace(x=x0, y=y0, frames=0, t0=time.perf_counter())
+
+    def tick():
+        state.x += 0.05  # 60 Hz'de 3 m/s
+        state.y += 0.02
+        view.plot(gdf, SimpleNamespace(x=state.x, y=state.y), 5.0, jobs, index)
+        view.repaint()
+        state.frames += 1
+        if state.frames % 300 == 0:
+            elapsed = time.perf_counter() - state.t0
+            print(f"{n} kazık: {state.frames / elapsed:.1f} fps, boyama {view.frame_time_ms:.2f} ms/kare")
+            state.frames, state.t0 = 0, time.perf_counter()
+
+    timer = QTimer()
+    timer.timeout.connect(tick)
+    timer.start(16)
+    sys.exit(app.exec_())
@@ -0,0 +1,317 @@
+import asyncio
+import math
+import struct
+import threading
+import time
+
+import numpy as np
+
+READ_INPUT_REGISTERS = 0x04
+MODBUS_BITS_PER_CHAR = 10  # 8N1: başlangıç + 8 veri + stop (eşlikli portlarda 11)
+MODBUS_RESPONSE_TIMEOUT = 0.1  # Sensör yanıtı için üst sınır (s)
+MODBUS_TURNAROUND = 0.001  # Sensörün isteği işleyip yanıt vermeye başlama süresi (tahmini, s)
+MODBUS_MAX_READ_REGISTERS = 125  # Tek read-input-registers isteğinde en fazla register
+SAMPLE_RING_SIZE = 4096  # 50 Hz'de ~80 s geçmiş
+
+
+class ModbusError(Exception):
+    """Yanıt yok, CRC hatalı, beklenmeyen çerçeve veya Modbus istisna yanıtı."""
+
+
+def _crc16_bitwise(data):
+    """CRC-16/MODBUS bit bit (tablo üretimi ve karşılaştırma için)."""
+    crc = 0xFFFF
+    for b in data:
+        crc ^= b
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def _crc16_table():
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC_TABLE = _crc16_table()
+
+
+def crc16(data):
+    """
+    Computes the Modbus RTU CRC-16 (polynomial 0xA001, initial 0xFFFF).
+
+    One table lookup per byte instead of eight shift/xor steps.
+
+    Args:
+        data (bytes | memoryview): Frame without the CRC.
+
+    Returns:
+        int: CRC; sent low byte first.
+    """
+    crc = 0xFFFF
+    table = _CRC_TABLE
+    for b in data:
+        crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
+    return crc
+
+
+def check_crc(frame):
+    """Son iki bayt (düşük bayt önce) çerçevenin CRC'si mi?"""
+    return len(frame) >= 4 and crc16(memoryview(frame)[:-2]) == frame[-2] | frame[-1] << 8
+
+
+def read_input_registers_request(slave, address, count=1):
+    """
+    Builds a read-input-registers (0x04) request frame.
+
+    Args:
+        slave (int): Slave address (1-247).
+        address (int): First register.
+        count (int, optional): Number of consecutive registers (1-125).
+
+    Returns:
+        bytes: Request including CRC.
+
+    Raises:
+        ValueError: If an argument is out of the Modbus range.
+    """
+    if not 1 <= count <= MODBUS_MAX_READ_REGISTERS:
+        raise ValueError(f"register sayısı 1-{MODBUS_MAX_READ_REGISTERS} olmalı: {count}")
+    if not 0 <= address <= 0xFFFF - count + 1:
+        raise ValueError(f"geçersiz register adresi: {address}")
+    frame = bytearray(struct.pack('>BBHH', slave, READ_INPUT_REGISTERS, address, count))
+    frame += struct.pack('<H', crc16(frame))
+    return bytes(frame)
+
+
+def read_registers_response_len(count):
+    """Normal yanıt uzunluğu: adres, fonksiyon, bayt sayısı, 2*count veri, CRC."""
+    return 5 + 2 * count
+
+
+def decode_registers(frame, count):
+    """
+    Decodes the registers of a validated read response without copying.
+
+    Args:
+        frame (bytes | bytearray | memoryview): Response frame.
+        count (int): Number of registers requested.
+
+    Returns:
+        np.ndarray: Read-only big-endian uint16 view into the frame.
+
+    Raises:
+        ModbusError: If the byte count field does not match.
+    """
+    view = memoryview(frame)
+    if view[2] != 2 * count:
+        raise ModbusError(f"{2 * count} veri baytı bekleniyordu, {view[2]} geldi")
+    return np.frombuffer(view, dtype='>u2', count=count, offset=3)
+
+
+def frame_gap(baudrate, bits_per_char=MODBUS_BITS_PER_CHAR):
+    """
+    Returns the RTU inter-frame silence (t3.5) for a baud rate.
+
+    Above 19200 baud the standard fixes it at 1.75 ms.
+    """
+    if baudrate > 19200:
+        return 0.00175
+    return 3.5 * bits_per_char / baudrate
+
+
+def max_poll_rate(baudrate, request_len=8, response_len=7, turnaround=MODBUS_TURNAROUND):
+    """
+    En yüksek yoklama hızı (Hz): istek + sensör gecikmesi + yanıt + sonraki
+    istekten önceki t3.5 sessizlik. Yanıt uzunluğu bilindiği için yanıtın
+    sonunda ayrıca sessizlik beklenmez.
+    """
+    char_time = MODBUS_BITS_PER_CHAR / baudrate
+    cycle = (request_len + response_len) * char_time + turnaround + frame_gap(baudrate)
+    return 1.0 / cycle
+
+
+class SampleRing:
+    """
+    Zaman damgalı, sabit boyutlu örnek halkası.
+
+    Yazan cihaz döngüsü, okuyan GUI iş parçacığıdır; kilit sadece indeks
+    ve iki dizi hücresini kapsar. Zaman time.monotonic() saniyesidir.
+    """
+
+    def __init__(self, size=SAMPLE_RING_SIZE):
+        self.times = np.full(size, np.nan)
+        self.values = np.full(size, np.nan)
+        self.count = 0  # Şimdiye kadar yazılan örnek sayısı
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.count, len(self.times))
+
+    def append(self, t, value):
+        with self._lock:
+            i = self.count % len(self.times)
+            self.times[i] = t
+            self.values[i] = value
+            self.count += 1
+
+    def latest(self):
+        """(zaman, değer) veya örnek yoksa None."""
+        with self._lock:
+            if not self.count:
+                return None
+            i = (self.count - 1) % len(self.times)
+            return self.times[i], self.values[i]
+
+    def snapshot(self, seconds=None):
+        """
+        Returns the buffered samples in time order.
+
+        Args:
+            seconds (float, optional): Only samples newer than this many
+                seconds before the latest one.
+
+        Returns:
+            tuple: (times, values) as new np.ndarray objects.
+        """
+        with self._lock:
+            size = len(self.times)
+            start = self.count % size if self.count > size else 0
+            order = np.roll(np.arange(min(self.count, size)), -start)
+            times, values = self.times[order], self.values[order]
+        if seconds is not None and len(times):
+            keep = times >= times[-1] - seconds
+            times, values = times[keep], values[keep]
+        return times, values
+
+
+class ModbusRtuClient:
+    """
+    AsyncSerial üzerinde Modbus RTU ana birimi.
+
+    İstekten önce hattın en az t3.5 sessiz kalması beklenir; yanıt,
+    beklenen uzunlukta veya t3.5 sessizlikle biter (sabit bekleme yok).
+    Yanıtın CRC'si, slave adresi ve fonksiyon kodu doğrulanır.
+    """
+
+    def __init__(self, port, baudrate, timeout=MODBUS_RESPONSE_TIMEOUT):
+        """
+        :param port: deviceLoop.AsyncSerial
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.gap = frame_gap(baudrate)
+        self.char_time = MODBUS_BITS_PER_CHAR / baudrate
+        self.n_requests = 0
+        self.n_timeouts = 0
+        self.n_crc_errors = 0
+        self.n_exceptions = 0
+
+    async def transact(self, request, response_len):
+        """
+        Sends one request frame and returns the validated response.
+
+        Args:
+            request (bytes): Complete request including CRC.
+            response_len (int): Length of a normal response including CRC.
+
+        Returns:
+            bytes: Response frame.
+
+        Raises:
+            ModbusError: Timeout, bad CRC, wrong slave/function or an
+                exception response.
+        """
+        loop = asyncio.get_running_loop()
+        # Hat en az t3.5 sessiz kalmadan yeni çerçeve başlatma
+        quiet = self.port.last_activity + self.gap - loop.time()
+        if quiet > 0:
+            await asyncio.sleep(quiet)
+        self.port.reset_input()
+        self.port.write(request)
+        self.n_requests += 1
+        # Yanıt, istek hatta tamamen çıktıktan sonra başlar
+        timeout = len(request) * self.char_time + self.timeout
+        response = await self.port.read_frame(response_len, timeout, self.gap)
+
+        if not response:
+            self.n_timeouts += 1
+            raise ModbusError("yanıt yok")
+        if not check_crc(response):
+            self.n_crc_errors += 1
+            raise ModbusError(f"CRC hatası: {response.hex(' ')}")
+        if response[0] != request[0] or response[1] & 0x7F != request[1]:
+            raise ModbusError(f"beklenmeyen çerçeve: {response.hex(' ')}")
+        if response[1] & 0x80:
+            self.n_exceptions += 1
+            raise ModbusError(f"Modbus istisnası {response[2]}")
+        if len(response) != response_len:
+            raise ModbusError(f"{response_len} bayt bekleniyordu, {len(response)} geldi")
+        return response
+
+    async def read_input_registers(self, slave, address, count=1):
+        """Tek istekte count adet ardışık input register oku (decode_registers görünümü)."""
+        request = read_input_registers_request(slave, address, count)
+        response = await self.transact(request, read_registers_response_len(count))
+        return decode_registers(response, count)
+
+
+async def poll(rate_hz, read, on_sample):
+    """
+    Polls at a fixed rate on an absolute schedule.
+
+    A slow or failed transaction delays the next one but does not make the
+    schedule drift; missed slots are skipped instead of bursting.
+
+    Args:
+        rate_hz (float): Poll rate.
+        read (callable): Coroutine function performing one read.
+        on_sample (callable): Called with (monotonic time, result) or
+            (monotonic time, ModbusError).
+    """
+    period = 1.0 / rate_hz
+    loop = asyncio.get_running_loop()
+    next_time = loop.time()
+    while True:
+        try:
+            result = await read()
+        except ModbusError as e:
+            result = e
+        on_sample(time.monotonic(), result)
+        next_time += period
+        now = loop.time()
+        if next_time < now:
+            next_time += math.ceil((now - next_time) / period) * period
+        await asyncio.sleep(next_time - now)
+
+
+if __name__ == "__main__":
+    # python modbusRtu.py: yoklama hızı sınırları ve CRC/çözme süreleri
+    for baud in (9600, 19200, 115200):
+        rates = ", ".join(f"{count} reg {max_poll_rate(baud, 8, read_registers_response_len(count)):.0f} Hz"
+                          for count in (1, 4, 16))
+        print(f"{baud} baud: t3.5 {frame_gap(baud) * 1000:.2f} ms, en yüksek yoklama: {rates}")
+
+    assert read_input_registers_request(1, 0, 1) == bytes.fromhex('01 04 00 00 00 01 31 CA')
+    values = np.arange(1000, 1016, dtype='>u2')
+    body = bytes((1, READ_INPUT_REGISTERS, 2 * len(values))) + values.tobytes()
+    response = body + struct.pack('<H', crc16(body))
+    assert check_crc(response) and _crc16_bitwise(body) == crc16(body)
+    assert np.array_equal(decode_registers(response, len(values)), values)
+
+    repeat = 20000
+    for name, fn in (("bit bit", _crc16_bitwise), ("tablo", crc16)):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            fn(response)
+        print(f"CRC {name:8s}: {(time.perf_counter() - t0) / repeat * 1e6:6.2f} µs / {len(response)} bayt")
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        decode_registers(response, len(values))
+    print(f"decode_registers: {(time.perf_counter() - t0) / repeat * 1e6:6.2f} µs / {len(values)} register")
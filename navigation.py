@@ -0,0 +1,409 @@
+import functools
+import math
+import threading
+
+import numpy as np
+from pyproj import CRS, Transformer
+
+# Navigasyon hesapları yerel metrik çerçevede (LocalFrame) yapılır; tüm uzunluklar metre
+TOLERANCE = 0.1  # 10 cm tolerans
+MAIN_VIEW_HALF_SIZE = 50  # Ana harita: araç etrafında 100 m x 100 m
+INDEX_CELL_SIZE = 10  # Uzamsal indeks hücresi 10 m
+WGS84 = 'EPSG:4326'
+# Kazık renkleri: mevcut hedef, tamamlanan, diğer (bekleyen / atlanan)
+PILE_COLOR_CURRENT = '#FDD05A'
+PILE_COLOR_DONE = '#2E765E'
+PILE_COLOR_OTHER = '#B24A3B'
+# Ölü hesap: son GNSS konumundan ekrana basılana kadar ileri tahmin
+PREDICT_MAX_DT = 0.5  # Bundan eski konumdan daha ileri tahmin yapılmaz (s)
+PREDICT_MIN_SPEED = 0.02  # Bunun altında (m/s) ve dönmüyorsa araç duruyor sayılır
+PREDICT_MIN_YAW_RATE = math.radians(0.5)  # rad/s
+GYRO_Z_SIGN = 1.0  # GPCHC gyro z pozitifken heading (saat yönü) artar; ters montajda -1
+
+
+@functools.lru_cache(maxsize=32)
+def get_transformer(src, dst, thread_id=None):
+    """
+    Returns a cached pyproj Transformer with x=lon/easting, y=lat/northing order.
+
+    Transformer objects must not be shared between threads, so callers
+    pass threading.get_ident() as thread_id to get one per thread.
+    """
+    return Transformer.from_crs(src, dst, always_xy=True)
+
+
+class LocalFrame:
+    """
+    WGS84 boylam/enlem ile yerel metrik çerçeve (x doğu, y kuzey, metre) arasında dönüşüm.
+
+    Varsayılan çerçeve, plan merkezine oturtulmuş bir transverse Mercator
+    izdüşümüdür; merkez noktası (0, 0) olur ve merkez meridyende grid
+    kuzeyi coğrafi kuzeyle çakışır, böylece GNSS yönü düzeltmesiz
+    kullanılır. crs verilirse (ör. 'EPSG:32636') o izdüşüm kullanılır ve
+    merkez yine orijine kaydırılır; bu durumda meridyen yakınsaması yöne
+    eklenmez. Dönüşümler diziler üzerinde vektöreldir.
+    """
+
+    def __init__(self, lon0, lat0, crs=None):
+        self.lon0 = float(lon0)
+        self.lat0 = float(lat0)
+        if crs is None:
+            crs = (f"+proj=tmerc +lat_0={self.lat0!r} +lon_0={self.lon0!r} +k=1 +x_0=0 +y_0=0 "
+                   f"+ellps=WGS84 +units=m +no_defs")
+        self.crs = CRS.from_user_input(crs)
+        self._crs_wkt = self.crs.to_wkt()
+        self.origin = (0.0, 0.0)
+        self.origin = self._transformer(False).transform(self.lon0, self.lat0)
+
+    @classmethod
+    def from_points(cls, lon, lat, crs=None):
+        """Noktaların sınır kutusunun ortasını merkez alan çerçeve."""
+        lon = np.asarray(lon, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64)
+        return cls((lon.min() + lon.max()) / 2, (lat.min() + lat.max()) / 2, crs)
+
+    def _transformer(self, inverse):
+        src, dst = (self._crs_wkt, WGS84) if inverse else (WGS84, self._crs_wkt)
+        return get_transformer(src, dst, threading.get_ident())
+
+    def forward(self, lon, lat):
+        """
+        Projects WGS84 coordinates into the local frame.
+
+        Args:
+            lon, lat (float | np.ndarray): Longitude and latitude in degrees.
+
+        Returns:
+            tuple: (x, y) in meters, scalars or arrays like the input.
+        """
+        x, y = self._transformer(False).transform(lon, lat)
+        return x - self.origin[0], y - self.origin[1]
+
+    def inverse(self, x, y):
+        """Yerel (x, y) metreden (boylam, enlem) dereceye."""
+        return self._transformer(True).transform(np.add(x, self.origin[0]), np.add(y, self.origin[1]))
+
+
+class VehicleFootprint:
+    """
+    Araç şekli ve kazık ucu için NumPy çekirdeği.
+
+    Şeklin 5 köşesi ve kazık ucu araç eksenlerinde bir kez hesaplanır
+    (metre, ön taraf +y). Her (x, y, heading) için tek bir 6x2 matris
+    çarpımıyla döndürülüp ötelenir; son sonuç saklanır, aynı konum için
+    tekrar hesaplanmaz. Dönen diziler salt okunurdur.
+    """
+
+    def __init__(self, vehicle_length=3004.71/1000, vehicle_width=880.97/1000, stake_offset=1297.53/1000):
+        self.dimensions = (vehicle_length, vehicle_width, stake_offset)
+        half_l, half_w = vehicle_length / 2, vehicle_width / 2
+        self.local = np.array([
+            (0, half_l),  # Üst nokta (yuvarlanmış uç)
+            (-half_w, -half_l),  # Sol alt
+            (half_w, -half_l),  # Sağ alt
+            (half_w, half_l),  # Sağ üst
+            (-half_w, half_l),  # Sol üst
+            (-stake_offset, 0),  # Kazık çakma noktası
+        ], dtype=np.float64)
+        self.hits = 0
+        self.misses = 0
+        self._last = (None, None)  # (anahtar, sonuç) tek atamayla değişir
+
+    def transform(self, x, y, heading):
+        """
+        Returns the footprint and stake tip for one pose, memoized on the last pose.
+
+        Args:
+            x, y (float): Vehicle position in the local frame (meters).
+            heading (float): Counter-clockwise rotation in radians.
+
+        Returns:
+            tuple: (5x2 footprint corners, 1x2 stake tip) as read-only arrays.
+        """
+        key = (float(x), float(y), float(heading))
+        last_key, result = self._last
+        if key == last_key:
+            self.hits += 1
+            return result
+        self.misses += 1
+        c, s = math.cos(key[2]), math.sin(key[2])
+        points = self.local @ np.array([[c, s], [-s, c]])
+        points += key[:2]
+        points.setflags(write=False)
+        result = (points[:5], points[5:])
+        self._last = (key, result)
+        return result
+
+    def stake_tips(self, x, y, heading):
+        """
+        Returns the stake tip for every pose of a trajectory at once.
+
+        Args:
+            x, y, heading (np.ndarray): Positions (meters) and headings (radians).
+
+        Returns:
+            np.ndarray: (n, 2) stake tip positions.
+        """
+        x, y, heading = (np.asarray(a, dtype=np.float64) for a in (x, y, heading))
+        c, s = np.cos(heading), np.sin(heading)
+        vx, vy = self.local[5]
+        return np.column_stack((x + c * vx - s * vy, y + s * vx + c * vy))
+
+    def footprints(self, x, y, heading):
+        """Her konum için (n, 5, 2) araç köşeleri."""
+        heading = np.asarray(heading, dtype=np.float64)
+        c, s = np.cos(heading), np.sin(heading)
+        rot = np.stack((np.stack((c, s), -1), np.stack((-s, c), -1)), -2)  # (n, 2, 2)
+        return np.einsum('kj,nji->nki', self.local[:5], rot) + np.stack((x, y), -1)[:, None, :]
+
+
+VEHICLE_FOOTPRINT = VehicleFootprint()
+
+
+def get_scaled_vehicle_coords(x, y, heading, vehicle_length=3004.71/1000, vehicle_width=880.97/1000, stake_offset=1297.53/1000):
+    """Aracı temsil eden döndürülmüş şeklin koordinatlarını döndür (yerel çerçevede, metre)."""
+    footprint = VEHICLE_FOOTPRINT
+    if (vehicle_length, vehicle_width, stake_offset) != footprint.dimensions:
+        footprint = VehicleFootprint(vehicle_length, vehicle_width, stake_offset)
+    return footprint.transform(x, y, heading)
+
+
+class PosePredictor:
+    """
+    Son GNSS konumundan istenen ana kadar araç pozu (ölü hesap).
+
+    Sabit hız ve dönüş hızı modeli: Ve/Vn hız vektörü gyro z ile
+    dönerken entegre edilir, heading aynı hızla döner. Zaman perf_counter
+    saniyesidir; konumun ölçüm anı alındığı an eksi receiver_latency
+    kabul edilir. Tahmin en fazla max_dt ileri gider, GNSS kesilirse araç
+    son tahminde durur. Sadece çizim içindir; tolerans kararı gerçek
+    konumla verilir. error, her yeni konumda tahminin ondan sapmasıdır (m).
+    """
+
+    def __init__(self, max_dt=PREDICT_MAX_DT, receiver_latency=0.0):
+        self.max_dt = max_dt
+        self.receiver_latency = receiver_latency
+        self.n_fixes = 0
+        self.error = 0.0
+        self._fix = None  # (t, x, y, heading, ve, vn, yaw_rate)
+
+    def reset(self):
+        self._fix = None
+
+    def update(self, t, x, y, heading, ve, vn, gyro_z):
+        """
+        Stores a real fix.
+
+        Args:
+            t (float): perf_counter time the fix was received.
+            x, y (float): Position in the local frame (m).
+            heading (float): Map heading (radians, counter-clockwise).
+            ve, vn (float): East and north velocity (m/s).
+            gyro_z (float): GPCHC yaw rate (deg/s).
+        """
+        t -= self.receiver_latency
+        if self._fix is not None:
+            px, py, _ = self.predict(t)
+            self.error = math.hypot(px - x, py - y)
+        # Harita heading'i saat yönü tersine; GPCHC heading saat yönünde
+        self._fix = (t, x, y, heading, ve, vn, -math.radians(gyro_z) * GYRO_Z_SIGN)
+        self.n_fixes += 1
+
+    def moving(self, t):
+        """Tahmin edilen poz t anında son konumdan farklı mı (ileri çizim gerekir mi)?"""
+        if self._fix is None:
+            return False
+        t0, _, _, _, ve, vn, yaw_rate = self._fix
+        return (t - t0 <= self.max_dt
+                and (math.hypot(ve, vn) >= PREDICT_MIN_SPEED or abs(yaw_rate) >= PREDICT_MIN_YAW_RATE))
+
+    def predict(self, t):
+        """t anındaki (x, y, heading); konum yoksa None."""
+        if self._fix is None:
+            return None
+        t0, x, y, heading, ve, vn, w = self._fix
+        dt = min(max(t - t0, 0.0), self.max_dt)
+        wdt = w * dt
+        if abs(w) < 1e-9:
+            dx, dy = ve * dt, vn * dt
+        else:
+            # Dönen hız vektörünün integrali: [[sin, -(1-cos)], [1-cos, sin]] / w
+            s, c = math.sin(wdt) / w, (1.0 - math.cos(wdt)) / w
+            dx, dy = s * ve - c * vn, c * ve + s * vn
+        return x + dx, y + dy, heading + wdt
+
+
+class GridIndex:
+    """
+    Kazık noktaları üzerinde düzgün ızgara (uniform grid) uzamsal indeksi.
+
+    Noktalar hücre numarasına göre bir kez sıralanır; her sorgu yalnızca
+    ilgili hücrelere bakar (hücre arama np.searchsorted ile O(log n)).
+    Koordinatlar hangi birimdeyse cell_size da o birimde verilmelidir.
+    """
+
+    def __init__(self, x, y, cell_size):
+        self.x = np.ascontiguousarray(x, dtype=np.float64)
+        self.y = np.ascontiguousarray(y, dtype=np.float64)
+        self.cell_size = float(cell_size)
+        if len(self.x) == 0:
+            self.x0 = self.y0 = 0.0
+            self.nx = self.ny = 1
+        else:
+            self.x0 = self.x.min()
+            self.y0 = self.y.min()
+            self.nx = int((self.x.max() - self.x0) // self.cell_size) + 1
+            self.ny = int((self.y.max() - self.y0) // self.cell_size) + 1
+
+        cells = self._cell_id(self._cell_x(self.x), self._cell_y(self.y))
+        self.order = np.argsort(cells, kind='stable')
+        self.cells, starts = np.unique(cells[self.order], return_index=True)
+        self.starts = np.append(starts, len(self.order)).astype(np.int64)
+
+    def __len__(self):
+        return len(self.x)
+
+    def _cell_x(self, x):
+        return np.clip(np.floor((x - self.x0) / self.cell_size), 0, self.nx - 1).astype(np.int64)
+
+    def _cell_y(self, y):
+        return np.clip(np.floor((y - self.y0) / self.cell_size), 0, self.ny - 1).astype(np.int64)
+
+    def _cell_id(self, ix, iy):
+        return iy * self.nx + ix
+
+    def _candidates(self, xmin, ymin, xmax, ymax):
+        """Kutuyla kesişen hücrelerdeki tüm nokta indeksleri (kaba filtre)."""
+        if len(self.x) == 0 or xmax < xmin or ymax < ymin:
+            return np.empty(0, dtype=np.int64)
+        ix0, ix1 = self._cell_x(np.array([xmin, xmax]))
+        iy0, iy1 = self._cell_y(np.array([ymin, ymax]))
+        ix, iy = np.meshgrid(np.arange(ix0, ix1 + 1), np.arange(iy0, iy1 + 1))
+        wanted = self._cell_id(ix.ravel(), iy.ravel())
+
+        pos = np.searchsorted(self.cells, wanted)
+        inside = pos < len(self.cells)
+        pos, wanted = pos[inside], wanted[inside]
+        pos = pos[self.cells[pos] == wanted]
+        if len(pos) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        # Hücre aralıklarını döngüsüz birleştir
+        starts = self.starts[pos]
+        lengths = self.starts[pos + 1] - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self.order[offsets + np.arange(lengths.sum())]
+
+    def query_box(self, xmin, ymin, xmax, ymax):
+        """
+        Returns indices of the points inside the box (inclusive), sorted.
+
+        Args:
+            xmin, ymin, xmax, ymax (float): Box bounds in coordinate units.
+
+        Returns:
+            np.ndarray: Point indices.
+        """
+        idx = self._candidates(xmin, ymin, xmax, ymax)
+        x, y = self.x[idx], self.y[idx]
+        idx = idx[(x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)]
+        idx.sort()
+        return idx
+
+    def query_radius(self, x, y, radius):
+        """(x, y) noktasına radius mesafesindeki noktaların indeksleri."""
+        idx = self._candidates(x - radius, y - radius, x + radius, y + radius)
+        d2 = (self.x[idx] - x) ** 2 + (self.y[idx] - y) ** 2
+        idx = idx[d2 <= radius * radius]
+        idx.sort()
+        return idx
+
+    def nearest(self, x, y, mask=None):
+        """
+        Returns the index of the point closest to (x, y).
+
+        Args:
+            x, y (float): Query position.
+            mask (np.ndarray, optional): Boolean array; only points where
+                mask is True are considered (e.g. pending piles).
+
+        Returns:
+            int: Index of the nearest point, or -1 if none qualifies.
+        """
+        if len(self.x) == 0:
+            return -1
+        extent = max(self.nx, self.ny) * self.cell_size
+        r = self.cell_size
+        while True:
+            idx = self._candidates(x - r, y - r, x + r, y + r)
+            if mask is not None:
+                idx = idx[mask[idx]]
+            if len(idx):
+                d2 = (self.x[idx] - x) ** 2 + (self.y[idx] - y) ** 2
+                best = int(np.argmin(d2))
+                # Kutunun dışındaki her nokta en az r uzakta
+                if d2[best] <= r * r:
+                    return int(idx[best])
+                r = float(np.sqrt(d2[best]))
+                idx = self._candidates(x - r, y - r, x + r, y + r)
+                if mask is not None:
+                    idx = idx[mask[idx]]
+                d2 = (self.x[idx] - x) ** 2 + (self.y[idx] - y) ** 2
+                return int(idx[np.argmin(d2)])
+            if r > extent + abs(x - self.x0) + abs(y - self.y0):
+                return -1
+            r *= 2
+
+
+def benchmark(log_source=None, n=100000):
+    """Eski liste tabanlı hesap ile çekirdeği, ve toplu kazık ucu hesabını karşılaştır."""
+    import time
+
+    def list_based(x, y, heading, vehicle_length=3004.71/1000, vehicle_width=880.97/1000, stake_offset=1297.53/1000):
+        local_coords = [(0, vehicle_length / 2), (-vehicle_width / 2, -vehicle_length / 2),
+                        (vehicle_width / 2, -vehicle_length / 2), (vehicle_width / 2, vehicle_length / 2),
+                        (-vehicle_width / 2, vehicle_length / 2), (-stake_offset, 0)]
+        rotated = [(x + (math.cos(heading) * vx - math.sin(heading) * vy),
+                    y + (math.sin(heading) * vx + math.cos(heading) * vy)) for vx, vy in local_coords]
+        return rotated[:5], rotated[5:]
+
+    if log_source:
+        from gnssLog import load_gpchc_logs
+        records = load_gpchc_logs(log_source)
+        frame = LocalFrame.from_points(records['longitude'], records['latitude'])
+        x, y = frame.forward(records['longitude'], records['latitude'])
+        heading = -np.radians(records['heading'].astype(np.float64))
+    else:
+        rng = np.random.default_rng(0)
+        x, y = np.cumsum(rng.normal(0, 0.05, (2, n)), axis=1)
+        heading = rng.uniform(-math.pi, math.pi, n)
+    n = len(x)
+    footprint = VehicleFootprint()
+
+    m = min(n, 20000)
+    t0 = time.perf_counter()
+    for i in range(m):
+        for _ in range(3):  # plot_gdf + iki harita
+            list_based(x[i], y[i], heading[i])
+    t_list = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for i in range(m):
+        for _ in range(3):
+            footprint.transform(x[i], y[i], heading[i])
+    t_kernel = time.perf_counter() - t0
+    print(f"kare başına 3 çağrı: liste {t_list / m * 1e6:.1f} µs, çekirdek {t_kernel / m * 1e6:.1f} µs "
+          f"({footprint.hits} önbellek isabeti)")
+
+    t0 = time.perf_counter()
+    tips = footprint.stake_tips(x, y, heading)
+    t_batch = time.perf_counter() - t0
+    expected = np.array([list_based(x[i], y[i], heading[i])[1][0] for i in range(min(n, 1000))])
+    err = np.abs(tips[:len(expected)] - expected).max()
+    print(f"{n} konum için toplu kazık ucu: {t_batch * 1000:.2f} ms (en büyük fark {err:.2e} m)")
+
+
+if __name__ == "__main__":
+    # python navigation.py [log dosyaları veya klasör]
+    import sys
+    args = sys.argv[1:]
+    benchmark(args[0] if len(args) == 1 else args or None)
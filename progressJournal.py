@@ -0,0 +1,267 @@
+import hashlib
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+# İş durumu günlükleri: plan içeriğinin SHA-1'i ile adlandırılır
+JOURNAL_DIR = os.path.join(os.path.expanduser('~'), '.rv_mazaka', 'journal')
+JOURNAL_FSYNC_INTERVAL = 1.0  # Elektrik kesintisinde kaybolabilecek en uzun süre (s)
+JOURNAL_SNAPSHOT_EVERY = 5000  # Bu kadar kayıttan sonra anlık görüntü al ve günlüğü sıfırla
+
+_JOURNAL_HEADER = struct.Struct('<4sIQ')  # magic, kazık sayısı, ilk kaydın sıra numarası
+_JOURNAL_MAGIC = b'RVJ1'
+_SNAPSHOT_MAGIC = b'RVS1'
+# Kayıt: kazık (dosyadaki satır), durum, zaman, Fletcher-16 sağlama
+_RECORD_DTYPE = np.dtype([('pile', '<u4'), ('status', 'i1'), ('time', '<f8'), ('check', '<u2')])
+_RECORD = struct.Struct('<IbdH')
+_BODY_SIZE = _RECORD.size - 2
+
+
+def _fletcher16(body):
+    """
+    Fletcher-16 checksum of each row of a (n, k) uint8 array.
+
+    s1 = sum(b_i) mod 255 and s2 = sum((k - i) * b_i) mod 255, which is the
+    usual running-sum definition written as one weighted sum so the whole
+    journal can be checked with two matrix products.
+    """
+    body = body.astype(np.int64)
+    weights = np.arange(body.shape[1], 0, -1, dtype=np.int64)
+    s1 = body.sum(axis=1) % 255
+    s2 = (body @ weights) % 255
+    return (s2 << 8 | s1).astype(np.uint16)
+
+
+def _pack_record(pile, status, stamp):
+    body = _RECORD.pack(pile, status, stamp, 0)[:_BODY_SIZE]
+    check = int(_fletcher16(np.frombuffer(body, dtype=np.uint8)[None, :])[0])
+    return body + struct.pack('<H', check)
+
+
+def plan_key(file_path):
+    """Plan dosyasının içeriğinden günlük anahtarı (SHA-1)."""
+    h = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _fsync_dir(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class ProgressJournal:
+    """
+    Sadece sona eklenen iş ilerleme günlüğü.
+
+    Her complete_job / reset_job için 15 baytlık bir kayıt doğrudan dosyaya
+    yazılır (Python tamponu yok, uygulama çökse de kayıt işletim
+    sistemindedir). fsync en fazla fsync_interval saniyede bir yapılır;
+    elektrik kesintisinde kaybolabilecek en uzun süre budur. Her
+    snapshot_every kayıtta durum dizisi anlık görüntü olarak yazılır ve
+    günlük sıfırlanır, böylece açılışta okunacak kayıt sayısı sınırlı kalır.
+    Kazıklar .c3d dosyasındaki satır numarasıyla tutulur; rota sırası
+    değişse de geri yükleme doğrudur.
+    """
+
+    def __init__(self, base_path, n, fsync_interval=JOURNAL_FSYNC_INTERVAL, snapshot_every=JOURNAL_SNAPSHOT_EVERY):
+        """
+        :param base_path: Uzantısız dosya yolu (.journal ve .snapshot eklenir)
+        :param n: Plandaki kazık sayısı
+        """
+        self.journal_path = base_path + '.journal'
+        self.snapshot_path = base_path + '.snapshot'
+        self.n = n
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.status = np.zeros(n, dtype=np.int8)  # Dosya satırına göre son durum
+        self.seq = 0  # Toplam kayıt sayısı
+        self.n_replayed = 0
+        self.n_fsync = 0
+        self._base_seq = 0
+        self._fd = None
+        self._dirty = False
+        self._last_fsync = time.monotonic()
+
+    @classmethod
+    def for_plan(cls, file_path, n, journal_dir=JOURNAL_DIR, **kwargs):
+        """Plan dosyasının içeriğine göre adlandırılmış günlük."""
+        os.makedirs(journal_dir, exist_ok=True)
+        return cls(os.path.join(journal_dir, plan_key(file_path)), n, **kwargs)
+
+    def replay(self):
+        """
+        Restores the status of every pile from the snapshot and the journal.
+
+        A torn or corrupt record at the end of the journal (e.g. after a
+        power cut) ends the replay and is cut off. Records already covered
+        by the snapshot are skipped.
+
+        Returns:
+            np.ndarray: int8 status per .c3d row (0 pending, 1 done, -1 skipped).
+        """
+        snapshot_seq = self._load_snapshot()
+        self.seq = snapshot_seq
+
+        data = b''
+        try:
+            with open(self.journal_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            pass
+        header_ok = False
+        if len(data) >= _JOURNAL_HEADER.size:
+            magic, n, base_seq = _JOURNAL_HEADER.unpack_from(data)
+            header_ok = magic == _JOURNAL_MAGIC and n == self.n
+        if not header_ok:
+            self._start_journal(self.seq)
+            return self.status.copy()
+
+        body = data[_JOURNAL_HEADER.size:]
+        count = len(body) // _RECORD.size
+        records = np.frombuffer(body, dtype=_RECORD_DTYPE, count=count)
+        raw = np.frombuffer(body, dtype=np.uint8, count=count * _RECORD.size).reshape(count, _RECORD.size)
+        bad = np.flatnonzero((_fletcher16(raw[:, :_BODY_SIZE]) != records['check'])
+                             | (records['pile'] >= self.n)
+                             | (records['status'] < -1) | (records['status'] > 1))
+        valid = int(bad[0]) if len(bad) else count
+
+        # Anlık görüntüde olan kayıtları atla, son yazılan geçerli
+        skip = max(0, min(snapshot_seq - base_seq, valid))
+        piles, status = records['pile'][skip:valid], records['status'][skip:valid]
+        if len(piles):
+            _, last = np.unique(piles[::-1], return_index=True)
+            last = len(piles) - 1 - last
+            self.status[piles[last]] = status[last]
+        self.n_replayed = len(piles)
+        self.seq = base_seq + valid
+        self._base_seq = base_seq
+
+        self._open(truncate_to=_JOURNAL_HEADER.size + valid * _RECORD.size)
+        return self.status.copy()
+
+    def append(self, pile, status):
+        """Bir durum değişikliğini günlüğe ekle."""
+        if self._fd is None:
+            self._start_journal(self.seq)
+        os.write(self._fd, _pack_record(int(pile), int(status), time.time()))
+        self.status[pile] = status
+        self.seq += 1
+        self._dirty = True
+        if self.seq - self._base_seq >= self.snapshot_every:
+            self.snapshot()
+        elif time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        """Bekleyen kayıtları diske zorla (zamanlayıcıdan da çağrılır)."""
+        if self._fd is not None and self._dirty:
+            os.fsync(self._fd)
+            self.n_fsync += 1
+            self._dirty = False
+        self._last_fsync = time.monotonic()
+
+    def snapshot(self):
+        """Durum dizisini atomik olarak yaz ve günlüğü boşalt."""
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_JOURNAL_HEADER.pack(_SNAPSHOT_MAGIC, self.n, self.seq))
+            f.write(self.status.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        _fsync_dir(os.path.dirname(self.snapshot_path) or '.')
+        # Çökme burada olursa eski günlük kayıtları açılışta atlanır (seq <= anlık görüntü)
+        self._start_journal(self.seq)
+
+    def close(self):
+        if self._fd is not None:
+            self.sync()
+            os.close(self._fd)
+            self._fd = None
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return 0
+        if len(data) != _JOURNAL_HEADER.size + self.n:
+            return 0
+        magic, n, seq = _JOURNAL_HEADER.unpack_from(data)
+        if magic != _SNAPSHOT_MAGIC or n != self.n:
+            return 0
+        self.status[:] = np.frombuffer(data, dtype=np.int8, offset=_JOURNAL_HEADER.size)
+        return seq
+
+    def _start_journal(self, base_seq):
+        """Sadece başlıktan oluşan yeni bir günlük dosyası başlat."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        tmp_path = self.journal_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_JOURNAL_HEADER.pack(_JOURNAL_MAGIC, self.n, base_seq))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+        _fsync_dir(os.path.dirname(self.journal_path) or '.')
+        self._base_seq = base_seq
+        self._open()
+
+    def _open(self, truncate_to=None):
+        self._fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | getattr(os, 'O_BINARY', 0))
+        if truncate_to is not None and os.fstat(self._fd).st_size != truncate_to:
+            os.ftruncate(self._fd, truncate_to)  # Yarım kalmış son kaydı at
+        self._dirty = False
+
+
+if __name__ == "__main__":
+    # python progressJournal.py [kayıt sayısı]: yazma ve açılışta geri yükleme süresini ölç
+    import tempfile
+
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    n_piles = 50000
+    rng = np.random.default_rng(0)
+    piles = rng.integers(0, n_piles, n_events)
+    states = rng.choice(np.array([1, -1], dtype=np.int8), n_events)
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, 'plan')
+        for snapshot_every in (n_events + 1, JOURNAL_SNAPSHOT_EVERY):
+            for suffix in ('.journal', '.snapshot'):
+                if os.path.exists(base + suffix):
+                    os.remove(base + suffix)
+            journal = ProgressJournal(base, n_piles, snapshot_every=snapshot_every)
+            journal.replay()
+            t0 = time.perf_counter()
+            for pile, state in zip(piles, states):
+                journal.append(pile, state)
+            t_write = time.perf_counter() - t0
+            expected = journal.status.copy()
+            journal.close()
+            # Son kaydı yarım bırak (elektrik kesintisi)
+            with open(base + '.journal', 'ab') as f:
+                f.write(b'\x01\x02\x03')
+
+            t0 = time.perf_counter()
+            reopened = ProgressJournal(base, n_piles)
+            restored = reopened.replay()
+            t_replay = time.perf_counter() - t0
+            reopened.close()
+            label = "anlık görüntüsüz" if snapshot_every > n_events else f"{snapshot_every} kayıtta bir görüntü"
+            print(f"{label}: {n_events} kayıt yazma {t_write * 1e6 / n_events:.1f} µs/kayıt "
+                  f"({journal.n_fsync} fsync), geri yükleme {t_replay * 1000:.1f} ms "
+                  f"({reopened.n_replayed} kayıt okundu), doğru: {np.array_equal(restored, expected)}")
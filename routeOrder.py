@@ -0,0 +1,430 @@
+import sys
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+from navigation import GridIndex, LocalFrame
+
+ROUTE_NEIGHBORS = 8  # 2-opt / Or-opt için komşu aday sayısı
+ROUTE_MAX_SECONDS = 5.0  # Komşu arama + iyileştirme süresi üst sınırı
+ROUTE_MIN_SPACING = 0.5  # Komşu arama ızgarası için en küçük kazık aralığı (m)
+ROUTE_DRIVE_SPEED = 0.5  # Rapor için ortalama sürüş hızı (m/s)
+
+RouteReport = namedtuple('RouteReport', ['n_piles', 'n_rows', 'length_before', 'length_after', 'seconds'])
+
+
+def route_length(x, y, order=None):
+    """Sırayla gezilen noktalar arasındaki toplam düz mesafe (açık yol)."""
+    if order is not None:
+        x, y = x[order], y[order]
+    return float(np.hypot(np.diff(x), np.diff(y)).sum())
+
+
+def row_groups(ids):
+    """
+    Groups piles into rows using the 'row.pile' id convention (e.g. '01.03').
+
+    Args:
+        ids (array-like): Pile ids as strings.
+
+    Returns:
+        list[np.ndarray] | None: Pile indices of each row in file order, or
+        None if the ids do not describe a row structure.
+    """
+    ids = np.asarray(ids, dtype=str)
+    if len(ids) < 4 or not np.char.find(ids, '.').min() > 0:
+        return None
+    prefix = np.array([i.rsplit('.', 1)[0] for i in ids])
+    _, first, inverse = np.unique(prefix, return_index=True, return_inverse=True)
+    if len(first) < 2 or len(first) > len(ids) // 2:
+        return None
+    order = np.argsort(inverse, kind='stable')
+    bounds = np.flatnonzero(np.diff(inverse[order])) + 1
+    rows = np.split(order, bounds)
+    rows.sort(key=lambda r: r[0])
+    return rows
+
+
+def _sort_along_row(x, y, members):
+    """Sıradaki kazıkları sıranın ana ekseni boyunca sırala."""
+    if len(members) < 3:
+        return members
+    px, py = x[members], y[members]
+    centered = np.column_stack((px - px.mean(), py - py.mean()))
+    axis = np.linalg.svd(centered, full_matrices=False)[2][0]
+    return members[np.argsort(centered @ axis, kind='stable')]
+
+
+def _grid_spacing(x, y):
+    """Ortalama kazık aralığı: alana göre, tek sıra (ptp 0) için uzunluğa göre; en az ROUTE_MIN_SPACING."""
+    n = len(x)
+    return max(np.sqrt(np.ptp(x) * np.ptp(y) / n), max(np.ptp(x), np.ptp(y)) / n, ROUTE_MIN_SPACING)
+
+
+def _knn(x, y, k, deadline=None):
+    """
+    k nearest neighbors of every point (excluding itself), nearest first.
+
+    Small inputs use one brute-force distance matrix. Larger ones are
+    processed cell by cell on a coarse GridIndex: each cell's points are
+    compared with the points in its bounding box plus a margin, and the
+    result is kept only where the k-th distance is inside the margin;
+    the rest is retried with a doubled margin. After the deadline
+    (time.perf_counter) the candidates found so far are accepted, so
+    some neighbor lists may be approximate.
+    """
+    n = len(x)
+    k = min(k, n - 1)
+    if n * n <= 4000000:
+        d2 = (x[:, None] - x[None, :]) ** 2 + (y[:, None] - y[None, :]) ** 2
+        np.fill_diagonal(d2, np.inf)
+        part = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        srt = np.argsort(np.take_along_axis(d2, part, 1), axis=1)
+        return np.take_along_axis(part, srt, 1)
+
+    out = np.empty((n, k), dtype=np.int64)
+    spacing = _grid_spacing(x, y)
+    index = GridIndex(x, y, spacing * 12)  # Hücre başına ~150 nokta
+    todo = [(index.order[index.starts[c]:index.starts[c + 1]], spacing * np.sqrt(k) * 2)
+            for c in range(len(index.cells))]
+    while todo:
+        pts, margin = todo.pop()
+        px, py = x[pts], y[pts]
+        x0, y0, x1, y1 = px.min() - margin, py.min() - margin, px.max() + margin, py.max() + margin
+        cand = index.query_box(x0, y0, x1, y1)
+        if len(cand) <= k:
+            todo.append((pts, margin * 2))
+            continue
+        d2 = (px[:, None] - x[cand][None, :]) ** 2 + (py[:, None] - y[cand][None, :]) ** 2
+        d2[pts[:, None] == cand[None, :]] = np.inf
+        part = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        dk = np.take_along_axis(d2, part, 1)
+        srt = np.argsort(dk, axis=1)
+        part, dk = np.take_along_axis(part, srt, 1), np.take_along_axis(dk, srt, 1)
+        # Kutunun dışındaki her nokta en az kenar mesafesi kadar uzakta
+        edge = np.minimum(np.minimum(px - x0, x1 - px), np.minimum(py - y0, y1 - py))
+        ok = dk[:, -1] <= edge ** 2
+        if deadline is not None and time.perf_counter() > deadline:
+            ok[:] = True  # Süre doldu: bulunan adaylarla yetin
+        out[pts[ok]] = cand[part[ok]]
+        if not ok.all():
+            todo.append((pts[~ok], margin * 2))
+    return out
+
+
+def _segment_neighbors(ax, ay, bx, by, single, k, deadline=None):
+    """Uç noktaları birbirine en yakın k parça."""
+    n = len(ax)
+    k = min(k, n - 1)
+    if single:
+        return _knn(ax, ay, k, deadline)
+    near = _knn(np.concatenate((ax, bx)), np.concatenate((ay, by)), min(2 * k + 1, 2 * n - 1), deadline) % n
+    out = np.empty((n, k), dtype=np.int64)
+    for s in range(n):
+        cand = np.concatenate((near[s], near[s + n]))
+        cand = cand[cand != s]
+        _, first = np.unique(cand, return_index=True)
+        best = cand[np.sort(first)][:k]
+        out[s] = np.resize(best, k)
+    return out
+
+
+def _nan0(d):
+    """NaN mesafeleri (turun sonundan sonrası) 0 say; fmax NaN'ı atlar."""
+    return np.fmax(d, 0.0)
+
+
+class _SegmentTour:
+    """
+    Yönlü parçalardan oluşan açık tur.
+
+    Her parçanın bir giriş (a) ve çıkış (b) noktası vardır; tek kazıkta
+    ikisi aynıdır, sırada sıranın iki ucudur. rev[s] True ise parça ters
+    yönde gezilir. Giriş/çıkış koordinatları tur konumuna göre de
+    tutulur; son konumdan sonraki sahte konum NaN'dır ve ona giden
+    kenarın uzunluğu 0 sayılır. İlk parça sabittir (başlangıç noktası).
+    """
+
+    def __init__(self, ax, ay, bx, by, order, rev, neighbors):
+        self.ax, self.ay, self.bx, self.by = ax, ay, bx, by
+        self.n = len(order)
+        self.order = np.asarray(order, dtype=np.int64)
+        self.rev = np.asarray(rev, dtype=bool).copy()
+        self.neighbors = neighbors
+        self.pos = np.empty(self.n, dtype=np.int64)
+        self.ix, self.iy, self.ox, self.oy = (np.full(self.n + 1, np.nan) for _ in range(4))
+        self._refresh()
+
+    def _refresh(self):
+        """Konum dizilerini order/rev'den yeniden kur."""
+        s = self.order
+        r = self.rev[s]
+        self.pos[s] = np.arange(self.n)
+        self.ix[:-1] = np.where(r, self.bx[s], self.ax[s])
+        self.iy[:-1] = np.where(r, self.by[s], self.ay[s])
+        self.ox[:-1] = np.where(r, self.ax[s], self.bx[s])
+        self.oy[:-1] = np.where(r, self.ay[s], self.by[s])
+
+    def _link(self, p, q):
+        """p konumunun çıkışından q konumunun girişine mesafe (q == n ise 0)."""
+        return _nan0(np.hypot(self.ix[q] - self.ox[p], self.iy[q] - self.oy[p]))
+
+    def length(self):
+        p = np.arange(self.n - 1)
+        return float(self._link(p, p + 1).sum())
+
+    def two_opt(self, i):
+        """
+        i konumundan çıkan kenar için en iyi 2-opt hamlesini uygula.
+
+        lo+1..hi arası ters çevrilir: yeni kenarlar çıkış(lo)-çıkış(hi) ve
+        giriş(lo+1)-giriş(hi+1). Hamle yapıldıysa etkilenen parçaları döndür.
+        """
+        js = self.pos[self.neighbors[self.order[i]]]
+        js = js[js != i]
+        if len(js) == 0:
+            return None
+        lo, hi = np.minimum(i, js), np.maximum(i, js)
+        old = self._link(lo, lo + 1) + self._link(hi, hi + 1)
+        new = (np.hypot(self.ox[hi] - self.ox[lo], self.oy[hi] - self.oy[lo])
+               + _nan0(np.hypot(self.ix[hi + 1] - self.ix[lo + 1], self.iy[hi + 1] - self.iy[lo + 1])))
+        gain = old - new
+        best = int(np.argmax(gain))
+        if gain[best] <= 1e-9:
+            return None
+        a, b = int(lo[best]) + 1, int(hi[best]) + 1
+        touched = self.order[[a - 1, a, b - 1] + ([b] if b < self.n else [])]
+        segment = self.order[a:b][::-1].copy()
+        self.rev[segment] ^= True
+        self.order[a:b] = segment
+        self.pos[segment] = np.arange(a, b)
+        self.ix[a:b], self.ox[a:b] = self.ox[a:b][::-1].copy(), self.ix[a:b][::-1].copy()
+        self.iy[a:b], self.oy[a:b] = self.oy[a:b][::-1].copy(), self.iy[a:b][::-1].copy()
+        return touched
+
+    def or_opt(self, i, length):
+        """i konumundan başlayan length parçalık bloğu en iyi yere taşı (gerekirse ters çevir)."""
+        end = i + length - 1
+        if i < 1 or end >= self.n:
+            return None
+        removal = (self._link(i - 1, i) + self._link(end, end + 1)
+                   - _nan0(np.hypot(self.ix[end + 1] - self.ox[i - 1], self.iy[end + 1] - self.oy[i - 1])))
+        cands = self.pos[np.concatenate((self.neighbors[self.order[i]], self.neighbors[self.order[end]]))]
+        ps = np.unique(np.concatenate((cands, cands - 1)))
+        ps = ps[(ps >= 0) & ((ps < i - 1) | (ps > end))]
+        if len(ps) == 0:
+            return None
+        base = self._link(ps, ps + 1)
+        nx, ny = self.ix[ps + 1], self.iy[ps + 1]
+        fwd = (np.hypot(self.ix[i] - self.ox[ps], self.iy[i] - self.oy[ps])
+               + _nan0(np.hypot(nx - self.ox[end], ny - self.oy[end])) - base)
+        bwd = (np.hypot(self.ox[end] - self.ox[ps], self.oy[end] - self.oy[ps])
+               + _nan0(np.hypot(nx - self.ix[i], ny - self.iy[i])) - base)
+        cost = np.minimum(fwd, bwd)
+        best = int(np.argmin(cost))
+        if removal - cost[best] <= 1e-9:
+            return None
+        p = int(ps[best])
+        touched = self.order[[i - 1, i, end, p] + [q for q in (end + 1, p + 1) if q < self.n]]
+        block = self.order[i:end + 1].copy()
+        if bwd[best] < fwd[best]:
+            block = block[::-1]
+            self.rev[block] ^= True
+        rest = np.concatenate((self.order[:i], self.order[end + 1:]))
+        if p > end:
+            p -= length
+        self.order = np.concatenate((rest[:p + 1], block, rest[p + 1:]))
+        self._refresh()
+        return touched
+
+    def improve(self, max_seconds=ROUTE_MAX_SECONDS):
+        """
+        2-opt ve Or-opt ile yerel iyileştirme ("don't look bits").
+
+        Kuyruktaki her parça için kendi kenarlarında hamle aranır; hamle
+        bulunamazsa parça kuyruktan çıkar, bir hamle komşu parçaları
+        yeniden kuyruğa ekler. Kuyruk boşalınca (veya süre dolunca) biter.
+        """
+        deadline = time.perf_counter() + max_seconds
+        queue = deque(self.order.tolist())
+        queued = np.ones(self.n, dtype=bool)
+        while queue:
+            s = queue.popleft()
+            queued[s] = False
+            p = int(self.pos[s])
+            touched = None
+            if p < self.n - 1:
+                touched = self.two_opt(p)
+            if touched is None and p > 0:
+                touched = self.two_opt(p - 1)
+            for length in (1, 2, 3):
+                if touched is not None:
+                    break
+                touched = self.or_opt(p, length)
+            if touched is not None:
+                for t in touched:
+                    if not queued[t]:
+                        queued[t] = True
+                        queue.append(t)
+            if time.perf_counter() > deadline:
+                break
+
+    def members_order(self, members):
+        """Parça sırasını kazık indekslerine aç."""
+        if members is None:
+            return self.order.copy()
+        return np.concatenate([members[s][::-1] if self.rev[s] else members[s] for s in self.order])
+
+
+def _nearest_neighbor(ax, ay, bx, by, single, neighbors):
+    """
+    İlk parçadan başlayan en yakın komşu turu.
+
+    Önce komşu listesindeki ilk gezilmemiş parçaya bakılır; hepsi
+    gezilmişse kalanlar arasında gerçek en yakın aranır. Sıralarda en
+    yakın uç giriş olur.
+    """
+    n = len(ax)
+    order = np.empty(n, dtype=np.int64)
+    rev = np.zeros(n, dtype=bool)
+    pending = np.ones(n, dtype=bool)
+    index = GridIndex(ax, ay, _grid_spacing(ax, ay) * 2) if single else None
+    order[0] = cur = 0
+    pending[0] = False
+    cx, cy = bx[0], by[0]
+    for k in range(1, n):
+        near = neighbors[cur]
+        near = near[pending[near]]
+        if len(near):
+            if single:
+                s = near[0]
+            else:
+                d = np.minimum(np.hypot(ax[near] - cx, ay[near] - cy), np.hypot(bx[near] - cx, by[near] - cy))
+                s = near[np.argmin(d)]
+        elif single:
+            s = index.nearest(cx, cy, pending)
+        else:
+            left = np.flatnonzero(pending)
+            d = np.minimum(np.hypot(ax[left] - cx, ay[left] - cy), np.hypot(bx[left] - cx, by[left] - cy))
+            s = left[np.argmin(d)]
+        rev[s] = np.hypot(bx[s] - cx, by[s] - cy) < np.hypot(ax[s] - cx, ay[s] - cy)
+        order[k] = cur = s
+        pending[s] = False
+        cx, cy = (ax[s], ay[s]) if rev[s] else (bx[s], by[s])
+    return order, rev
+
+
+def optimize_route(x, y, rows=None, max_seconds=ROUTE_MAX_SECONDS):
+    """
+    Finds a short visiting order for the piles, starting at pile 0.
+
+    A nearest-neighbor tour is improved with 2-opt and Or-opt moves over
+    a k-nearest candidate list; every move's gain is evaluated for all
+    candidates at once with NumPy. When rows are given, each row is kept
+    together and driven end to end, and only the order and direction of
+    the rows are optimized.
+
+    Args:
+        x, y (np.ndarray): Pile positions in meters.
+        rows (list[np.ndarray], optional): Pile indices of each row.
+        max_seconds (float, optional): Time limit of the neighbor search
+            and improvement phases together.
+
+    Returns:
+        np.ndarray: Pile indices in visiting order.
+    """
+    deadline = time.perf_counter() + max_seconds
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) < 3:
+        return np.arange(len(x))
+    members = None
+    if rows is not None:
+        members = [_sort_along_row(x, y, np.asarray(r, dtype=np.int64)) for r in rows]
+        # İlk kazığın sırası başa gelsin
+        first = next(k for k, r in enumerate(members) if 0 in r)
+        members.insert(0, members.pop(first))
+        if members[0][-1] == 0:
+            members[0] = members[0][::-1]
+        ax = np.array([x[r[0]] for r in members])
+        ay = np.array([y[r[0]] for r in members])
+        bx = np.array([x[r[-1]] for r in members])
+        by = np.array([y[r[-1]] for r in members])
+    else:
+        ax, ay, bx, by = x, y, x, y
+
+    single = members is None
+    neighbors = _segment_neighbors(ax, ay, bx, by, single, ROUTE_NEIGHBORS, deadline)
+    order, rev = _nearest_neighbor(ax, ay, bx, by, single, neighbors)
+    tour = _SegmentTour(ax, ay, bx, by, order, rev, neighbors)
+    tour.improve(max(0.0, deadline - time.perf_counter()))
+    return tour.members_order(members)
+
+
+def optimize_plan_order(data, use_rows=True, max_seconds=ROUTE_MAX_SECONDS):
+    """
+    Optimizes the visiting order of a .c3d plan DataFrame.
+
+    Args:
+        data (pd.DataFrame): Plan with easting (lon) / northing (lat) columns.
+        use_rows (bool, optional): Keep 'row.pile' rows together if present.
+        max_seconds (float, optional): Time limit of the neighbor search
+            and improvement phases.
+
+    Returns:
+        tuple: (row order as np.ndarray, RouteReport).
+    """
+    t0 = time.perf_counter()
+    lon = data['easting'].to_numpy(dtype=np.float64)
+    lat = data['northing'].to_numpy(dtype=np.float64)
+    if len(lon) == 0:
+        return np.arange(0), RouteReport(0, 0, 0.0, 0.0, 0.0)
+    x, y = LocalFrame.from_points(lon, lat).forward(lon, lat)
+    rows = row_groups(data['id'].to_numpy()) if use_rows else None
+    order = optimize_route(x, y, rows, max_seconds)
+    before = route_length(x, y)
+    after = route_length(x, y, order)
+    if after > before:
+        # Dosya sırası zaten daha iyiyse dokunma
+        order, after = np.arange(len(x)), before
+    report = RouteReport(len(x), len(rows) if rows else 0, before, after, time.perf_counter() - t0)
+    return order, report
+
+
+def format_route_report(report, speed=ROUTE_DRIVE_SPEED):
+    """Raporu tek satırlık metne çevir."""
+    saved = report.length_before - report.length_after
+    percent = 100 * saved / report.length_before if report.length_before else 0.0
+    return (f"Rota: {report.n_piles} kazık, sürüş mesafesi {report.length_before:.1f} m -> "
+            f"{report.length_after:.1f} m (%{percent:.1f} azalma, {speed} m/s'de {saved / speed / 60:.1f} dk kazanç), "
+            f"{report.seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    # python routeOrder.py [plan.c3d | kazık sayısı]
+    import pandas as pd
+    from c3dReader import load_c3d
+
+    arg = sys.argv[1] if len(sys.argv) > 1 else '10000'
+    if arg.isdigit():
+        # Sentetik saha: 3 m aralıklı sıralar, dosyada sıralar karışık ve yarısı ters yönde
+        n = int(arg)
+        rng = np.random.default_rng(0)
+        per_row = 50
+        n_rows = -(-n // per_row)
+        row_ids = rng.permutation(n_rows)
+        ids, lon, lat = [], [], []
+        for r in row_ids:
+            piles = range(per_row) if r % 2 else range(per_row - 1, -1, -1)
+            for p in piles:
+                ids.append(f"{r:03d}.{p:02d}")
+                lon.append(35.38 + r * 6 / 88000 + rng.normal(0, 0.02) / 88000)
+                lat.append(38.69 + p * 3 / 111320)
+        data = pd.DataFrame({'id': ids[:n], 'easting': lon[:n], 'northing': lat[:n]})
+    else:
+        data = load_c3d(arg)
+
+    for use_rows in (True, False):
+        order, report = optimize_plan_order(data, use_rows)
+        print(("sıra korunarak  " if use_rows else "serbest         ") + format_route_report(report))